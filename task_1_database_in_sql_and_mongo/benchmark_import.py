@@ -0,0 +1,244 @@
+"""
+Import Benchmark Suite for the HR Employee Attrition Importers
+This script generates synthetic datasets of increasing size, loads each one
+with MySQLDataImporter and MongoDBDataImporter, and records rows/sec, peak RSS
+and per-phase timings in a baseline JSON file that can be diffed between versions
+
+Point MYSQL_* and MONGODB_* at disposable local databases (for example the
+Docker containers in README.md): every benchmark run cleans the tables and
+collections before loading. Import settings such as MYSQL_IMPORT_MODE,
+MYSQL_BATCH_SIZE or BULK_LOAD are read from the environment as usual.
+
+Usage:
+    python benchmark_import.py --rows 10000 100000
+    python benchmark_import.py --rows 1000000 --targets mysql --compare benchmark_baseline.json
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import queue
+import resource
+import subprocess
+import time
+from datetime import datetime
+from dotenv import load_dotenv
+
+from generate_hr_data import HRDataGenerator, SAMPLE_FILE_PATH
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Where generated datasets are cached between runs
+BENCHMARK_DATA_DIR = os.getenv('BENCHMARK_DATA_DIR', 'benchmark_data')
+
+# Seconds between checks that the benchmark process is still running
+RESULT_POLL_SECONDS = 5
+
+# Environment settings recorded with every baseline
+BENCHMARK_SETTINGS = [
+    'CSV_CHUNK_SIZE', 'USE_SNAPSHOT', 'BULK_LOAD', 'MYSQL_IMPORT_MODE',
+    'MYSQL_BATCH_SIZE', 'MYSQL_WORKERS', 'MONGODB_IMPORT_MODE', 'MONGODB_BATCH_SIZE'
+]
+
+
+def run_benchmark_case(target: str, csv_path: str, results: multiprocessing.Queue):
+    """Load one dataset into one database and report timings (runs in a child process)"""
+    # The importers read CSV_FILE_PATH when they are imported
+    os.environ['CSV_FILE_PATH'] = csv_path
+    phases = {'connect_and_clean': 0.0, 'start': 0.0, 'parse': 0.0, 'load': 0.0, 'finish': 0.0}
+    row_count = 0
+    importer = None
+    try:
+        # Import and construct inside the try so a failure is reported, not lost with the child
+        if target == 'mysql':
+            from mysql_import import MySQLDataImporter
+            importer = MySQLDataImporter()
+            connect, clean = importer.connect_mysql, importer.clean_tables
+        else:
+            from mongodb_import import MongoDBDataImporter
+            importer = MongoDBDataImporter()
+            connect, clean = importer.connect_mongodb, importer.clean_collections
+
+        phase_start = time.perf_counter()
+        connect()
+        clean()
+        phases['connect_and_clean'] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        importer.start_import()
+        phases['start'] = time.perf_counter() - phase_start
+
+        # Time reading/cleaning the chunks separately from writing them
+        chunks = importer.iter_csv_chunks()
+        while True:
+            phase_start = time.perf_counter()
+            chunk = next(chunks, None)
+            phases['parse'] += time.perf_counter() - phase_start
+            if chunk is None:
+                break
+
+            phase_start = time.perf_counter()
+            importer.load_chunk(chunk)
+            phases['load'] += time.perf_counter() - phase_start
+            row_count += len(chunk)
+
+        phase_start = time.perf_counter()
+        importer.finish_import()
+        phases['finish'] = time.perf_counter() - phase_start
+
+        total = sum(phases.values())
+        results.put({
+            'target': target,
+            'rows': row_count,
+            'total_seconds': round(total, 3),
+            'rows_per_sec': round(row_count / total, 1) if total > 0 else 0,
+            # ru_maxrss is reported in kilobytes on Linux
+            'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            'phases': {name: round(seconds, 3) for name, seconds in phases.items()}
+        })
+
+    except Exception as e:
+        logger.error(f"{target} benchmark failed: {e}")
+        results.put({'target': target, 'rows': row_count, 'error': str(e)})
+
+    finally:
+        if importer is not None:
+            importer.close_connection()
+
+
+class ImportBenchmark:
+    """Class to run the importer benchmarks and manage baseline files"""
+
+    def __init__(self, sample_path: str = SAMPLE_FILE_PATH, data_dir: str = BENCHMARK_DATA_DIR):
+        """Initialize the benchmark with the sample dataset to model on"""
+        self.sample_path = sample_path
+        self.data_dir = data_dir
+        self.generator = None
+
+    def get_dataset(self, rows: int) -> str:
+        """Return the synthetic CSV for a size, generating it on first use"""
+        csv_path = os.path.join(self.data_dir, f"hr_synthetic_{rows}.csv")
+        if not os.path.exists(csv_path):
+            os.makedirs(self.data_dir, exist_ok=True)
+            if self.generator is None:
+                self.generator = HRDataGenerator(self.sample_path)
+            self.generator.generate(rows, csv_path)
+        return csv_path
+
+    def run_case(self, target: str, rows: int) -> dict:
+        """Run one benchmark in a fresh process so its peak RSS is measured on its own"""
+        csv_path = self.get_dataset(rows)
+        logger.info(f"Benchmarking {target} import of {rows} rows...")
+
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        process = context.Process(target=run_benchmark_case, args=(target, csv_path, results))
+        process.start()
+        result = None
+        while result is None:
+            try:
+                result = results.get(timeout=RESULT_POLL_SECONDS)
+            except queue.Empty:
+                # A child killed by a signal or the OOM killer never reports back
+                if not process.is_alive() and results.empty():
+                    result = {
+                        'target': target, 'rows': 0,
+                        'error': f"benchmark process exited with code {process.exitcode}"
+                    }
+                    logger.error(f"{target} benchmark failed: {result['error']}")
+        process.join()
+
+        result['dataset_rows'] = rows
+        if 'error' not in result:
+            logger.info(
+                f"{target} {rows} rows: {result['rows_per_sec']:.0f} rows/sec, "
+                f"peak RSS {result['peak_rss_mb']:.1f} MB"
+            )
+        return result
+
+    def run(self, sizes: list, targets: list) -> dict:
+        """Run every target against every dataset size"""
+        return {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': get_git_commit(),
+            'python': platform.python_version(),
+            'settings': {name: os.getenv(name) for name in BENCHMARK_SETTINGS},
+            'results': [self.run_case(target, rows) for rows in sizes for target in targets]
+        }
+
+
+def get_git_commit() -> str:
+    """Return the current git commit, if the benchmark runs inside the repository"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_baselines(baseline: dict, current: dict):
+    """Print rows/sec and peak RSS changes against an earlier baseline"""
+    previous = {
+        (result['target'], result['dataset_rows']): result
+        for result in baseline['results'] if 'error' not in result
+    }
+
+    print("\n" + "="*60)
+    print(f"COMPARISON WITH BASELINE {baseline.get('git_commit')} ({baseline['created_at']})")
+    print("="*60)
+    for result in current['results']:
+        key = (result['target'], result['dataset_rows'])
+        if 'error' in result or key not in previous:
+            continue
+        old = previous[key]
+        speed_change = (result['rows_per_sec'] / old['rows_per_sec'] - 1) * 100 if old['rows_per_sec'] else 0
+        print(
+            f"{key[0]} {key[1]} rows: {old['rows_per_sec']:.0f} -> {result['rows_per_sec']:.0f} rows/sec "
+            f"({speed_change:+.1f}%), peak RSS {old['peak_rss_mb']:.1f} -> {result['peak_rss_mb']:.1f} MB"
+        )
+    print("="*60)
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Benchmark the MySQL and MongoDB importers")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000],
+                        help="Dataset sizes to benchmark")
+    parser.add_argument('--targets', nargs='+', choices=['mysql', 'mongodb'],
+                        default=['mysql', 'mongodb'], help="Databases to benchmark")
+    parser.add_argument('--sample', default=SAMPLE_FILE_PATH, help="Sample CSV to model the data on")
+    parser.add_argument('--output', default='benchmark_baseline.json', help="Baseline JSON file to write")
+    parser.add_argument('--compare', help="Earlier baseline JSON file to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    benchmark = ImportBenchmark(args.sample)
+    report = benchmark.run(args.rows, args.targets)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Wrote benchmark results to {args.output}")
+
+    if baseline:
+        compare_baselines(baseline, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Dual-Sink Data Import Script for HR Employee Attrition Dataset
+This script parses the CSV once and loads every chunk into MySQL and MongoDB
+concurrently, reusing the import logic of mysql_import.py and mongodb_import.py
+
+Each database has its own sink thread fed through a bounded queue, so the
+reader never holds more than a few chunks in memory and a full refresh takes
+about as long as the slower of the two databases.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from dotenv import load_dotenv
+
+from mysql_import import MySQLDataImporter, CSV_FILE_PATH
+from mongodb_import import MongoDBDataImporter
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Parsed chunks each sink may have waiting before the reader blocks
+QUEUE_SIZE = int(os.getenv('DUAL_SINK_QUEUE_SIZE', 2))
+
+
+class ImportSink:
+    """Feeds queued CSV chunks into one importer on a dedicated thread"""
+
+    def __init__(self, name: str, importer, queue_size: int = QUEUE_SIZE):
+        self.name = name
+        self.importer = importer
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = threading.Thread(target=self.run, name=f"{name}-sink", daemon=True)
+        self.row_count = 0
+        self.chunk_count = 0
+        self.busy_time = 0.0
+        self.elapsed_time = 0.0
+        self.error = None
+        self.aborted = False
+
+    def start(self):
+        """Prepare the importer and start the sink thread"""
+        self.importer.start_import()
+        self.thread.start()
+
+    def stop(self, abort: bool = False):
+        """Send the end-of-data marker; an aborted sink stops without finishing the import"""
+        self.aborted = abort
+        self.queue.put(None)
+
+    def run(self):
+        """Load chunks until the end-of-data marker, then finish the import"""
+        start_time = time.perf_counter()
+
+        while True:
+            chunk = self.queue.get()
+            if chunk is None:
+                break
+            # A failed sink keeps draining its queue so the reader never blocks on it
+            if self.error:
+                continue
+
+            chunk_start = time.perf_counter()
+            try:
+                self.importer.load_chunk(chunk)
+                self.row_count += len(chunk)
+                self.chunk_count += 1
+            except Exception as e:
+                self.error = e
+                logger.error(f"{self.name} sink failed on chunk {self.chunk_count + 1}: {e}")
+            self.busy_time += time.perf_counter() - chunk_start
+
+        # An aborted run saw only part of the data, so it must not finish the
+        # import (deletion of missing employees, summary rebuilds)
+        if not self.error and not self.aborted:
+            try:
+                self.importer.finish_import()
+            except Exception as e:
+                self.error = e
+                logger.error(f"{self.name} sink failed while finishing the import: {e}")
+
+        self.elapsed_time = time.perf_counter() - start_time
+
+    def report(self):
+        """Log rows loaded, throughput and status for this sink"""
+        rate = self.row_count / self.elapsed_time if self.elapsed_time > 0 else 0
+        status = f"FAILED ({self.error})" if self.error else "OK"
+        logger.info(
+            f"{self.name}: {self.row_count} rows in {self.chunk_count} chunks, "
+            f"{self.elapsed_time:.2f}s ({rate:.0f} rows/sec, busy {self.busy_time:.2f}s) - {status}"
+        )
+
+
+class DualSinkImporter:
+    """Class to import the HR Attrition dataset into MySQL and MongoDB in one pass"""
+
+    def __init__(self):
+        """Initialize both database importers"""
+        self.mysql_importer = MySQLDataImporter()
+        self.mongo_importer = MongoDBDataImporter()
+        self.sinks = []
+
+    def close_connections(self):
+        """Close both database connections"""
+        self.mysql_importer.close_connection()
+        self.mongo_importer.close_connection()
+
+    def run_import(self):
+        """Main method to run the complete dual-sink import process"""
+        try:
+            # Connect to both databases
+            self.mysql_importer.connect_mysql()
+            self.mongo_importer.connect_mongodb()
+
+            # Ask user if they want to clean existing data
+            response = input("\nDo you want to clean existing data before import? (y/n): ").lower()
+            if response == 'y':
+                logger.info("Cleaning existing data...")
+                self.mysql_importer.clean_tables()
+                self.mongo_importer.clean_collections()
+
+            self.sinks = [
+                ImportSink('MySQL', self.mysql_importer),
+                ImportSink('MongoDB', self.mongo_importer)
+            ]
+            for sink in self.sinks:
+                sink.start()
+
+            # Parse and validate the CSV once, then fan each chunk out to both sinks
+            logger.info("Streaming CSV data to MySQL and MongoDB...")
+            start_time = time.perf_counter()
+            read_complete = False
+            try:
+                for chunk in self.mysql_importer.iter_csv_chunks():
+                    for sink in self.sinks:
+                        sink.queue.put(chunk)
+                read_complete = True
+            finally:
+                # Release the sink threads even when reading fails, so none stays
+                # blocked on its queue
+                for sink in self.sinks:
+                    sink.stop(abort=not read_complete)
+                for sink in self.sinks:
+                    sink.thread.join()
+            elapsed = time.perf_counter() - start_time
+
+            print("\n" + "="*60)
+            print("DUAL-SINK IMPORT RESULTS")
+            print("="*60)
+            for sink in self.sinks:
+                sink.report()
+            logger.info(f"Total wall-clock time: {elapsed:.2f}s")
+
+            failed = [sink.name for sink in self.sinks if sink.error]
+            if failed:
+                raise RuntimeError(f"Import failed for: {', '.join(failed)}")
+
+            # Verify insertion
+            logger.info("Verifying data insertion...")
+            self.mysql_importer.verify_data()
+            self.mongo_importer.verify_data()
+
+            logger.info("\n✅ Dual-sink data import completed successfully!")
+
+        except Exception as e:
+            logger.error(f"Import failed: {e}")
+            raise
+
+        finally:
+            self.close_connections()
+
+
+def main():
+    """Main execution function"""
+    print("=" * 60)
+    print("DUAL-SINK DATA IMPORT SCRIPT FOR HR EMPLOYEE ATTRITION")
+    print("=" * 60)
+    print("\nDataset: IBM HR Analytics Employee Attrition")
+    print("Target: MySQL and MongoDB Databases")
+    print("-" * 60)
+
+    # Check if CSV file exists
+    if not os.path.exists(CSV_FILE_PATH):
+        print(f"\n❌ ERROR: CSV file not found at '{CSV_FILE_PATH}'")
+        print("Please download the dataset from Kaggle and place it in the current directory")
+        print("URL: https://www.kaggle.com/pavansubhasht/ibm-hr-analytics-attrition-dataset")
+        return
+
+    # Create importer instance
+    importer = DualSinkImporter()
+
+    try:
+        # Run import
+        importer.run_import()
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Import interrupted by user")
+    except Exception as e:
+        print(f"\n❌ Import failed with error: {e}")
+        return
+
+    print("\n" + "=" * 60)
+    print("DUAL-SINK IMPORT COMPLETED!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
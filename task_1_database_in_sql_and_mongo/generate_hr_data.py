@@ -0,0 +1,146 @@
+"""
+Synthetic Data Generator for the HR Employee Attrition Dataset
+This script writes CSV files with the same 35-column schema as
+hr_employee_attrition.csv, from 10k to 10M rows, for load and scale testing
+
+Rows are bootstrapped from the 1,470-row sample so the joint distributions
+(MonthlyIncome against JobLevel, JobRole within Department, attrition rates
+and so on) carry over, then the numeric columns are jittered within the
+sample's ranges and the tenure columns are made consistent again.
+
+Usage:
+    python generate_hr_data.py --rows 100000
+    python generate_hr_data.py --rows 10000000 --output hr_synthetic_10m.csv --seed 7
+"""
+
+import argparse
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# The real dataset the synthetic rows are modelled on
+SAMPLE_FILE_PATH = os.getenv('CSV_FILE_PATH', 'hr_employee_attrition.csv')
+
+# Rows generated and written per chunk
+GENERATOR_CHUNK_SIZE = 100000
+
+# Absolute jitter applied to each numeric column before clipping to the sample range
+COLUMN_JITTER = {
+    'Age': 2,
+    'DistanceFromHome': 2,
+    'DailyRate': 50,
+    'HourlyRate': 5,
+    'MonthlyRate': 1000,
+    'NumCompaniesWorked': 1,
+    'TotalWorkingYears': 1,
+    'TrainingTimesLastYear': 1,
+    'YearsAtCompany': 1
+}
+
+# MonthlyIncome is scaled by up to this fraction, then kept within its JobLevel's range
+INCOME_JITTER = 0.05
+
+
+class HRDataGenerator:
+    """Class to generate synthetic HR Attrition rows modelled on the sample dataset"""
+
+    def __init__(self, sample_path: str = SAMPLE_FILE_PATH, seed: int = 42):
+        """Load the sample dataset and its per-column ranges"""
+        if not os.path.exists(sample_path):
+            raise FileNotFoundError(f"Sample CSV file not found: {sample_path}")
+
+        self.sample = pd.read_csv(sample_path)
+        self.rng = np.random.default_rng(seed)
+        self.column_ranges = {
+            col: (self.sample[col].min(), self.sample[col].max()) for col in COLUMN_JITTER
+        }
+        self.income_ranges = self.sample.groupby('JobLevel')['MonthlyIncome'].agg(['min', 'max'])
+        logger.info(f"Loaded {len(self.sample)} sample records from {sample_path}")
+
+    def generate_chunk(self, rows: int, first_employee_number: int) -> pd.DataFrame:
+        """Generate rows with consecutive EmployeeNumbers starting at first_employee_number"""
+        # Whole sample rows keep the correlations between columns
+        picks = self.rng.integers(0, len(self.sample), rows)
+        df = self.sample.iloc[picks].reset_index(drop=True)
+        df['EmployeeNumber'] = np.arange(first_employee_number, first_employee_number + rows)
+
+        for col, jitter in COLUMN_JITTER.items():
+            low, high = self.column_ranges[col]
+            df[col] = (df[col] + self.rng.integers(-jitter, jitter + 1, rows)).clip(low, high)
+
+        income_scale = 1 + self.rng.uniform(-INCOME_JITTER, INCOME_JITTER, rows)
+        level_ranges = self.income_ranges.loc[df['JobLevel']]
+        df['MonthlyIncome'] = (df['MonthlyIncome'] * income_scale).round().clip(
+            level_ranges['min'].to_numpy(), level_ranges['max'].to_numpy()
+        ).astype('int64')
+
+        # Restore the tenure ordering the jitter may have broken
+        df['TotalWorkingYears'] = np.minimum(df['TotalWorkingYears'], df['Age'] - 18).clip(lower=0)
+        df['YearsAtCompany'] = np.minimum(df['YearsAtCompany'], df['TotalWorkingYears'])
+        for col in ['YearsInCurrentRole', 'YearsSinceLastPromotion', 'YearsWithCurrManager']:
+            df[col] = np.minimum(df[col], df['YearsAtCompany'])
+
+        return df
+
+    def generate(self, rows: int, output_path: str, chunk_size: int = GENERATOR_CHUNK_SIZE) -> str:
+        """Write a synthetic CSV of the given size in chunks"""
+        written = 0
+        with open(output_path, 'w', newline='') as f:
+            while written < rows:
+                chunk = self.generate_chunk(min(chunk_size, rows - written), written + 1)
+                chunk.to_csv(f, header=written == 0, index=False)
+                written += len(chunk)
+                logger.info(f"Generated {written}/{rows} records...")
+
+        logger.info(f"Wrote {written} synthetic records to {output_path}")
+        return output_path
+
+    def compare(self, df: pd.DataFrame):
+        """Print key statistics of the synthetic rows next to the sample's"""
+        checks = {
+            'MonthlyIncome ~ JobLevel correlation': lambda d: d['MonthlyIncome'].corr(d['JobLevel']),
+            'TotalWorkingYears ~ Age correlation': lambda d: d['TotalWorkingYears'].corr(d['Age']),
+            'Attrition rate': lambda d: (d['Attrition'] == 'Yes').mean(),
+            'Mean MonthlyIncome': lambda d: d['MonthlyIncome'].mean()
+        }
+
+        print("\n" + "="*60)
+        print("SYNTHETIC DATA CHECK (sample vs synthetic)")
+        print("="*60)
+        for name, statistic in checks.items():
+            print(f"{name}: {statistic(self.sample):.3f} vs {statistic(df):.3f}")
+        print("="*60)
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Generate a synthetic HR Attrition CSV")
+    parser.add_argument('--rows', type=int, default=10000, help="Number of rows to generate")
+    parser.add_argument('--output', help="Output CSV file (default: hr_synthetic_<rows>.csv)")
+    parser.add_argument('--sample', default=SAMPLE_FILE_PATH, help="Sample CSV to model the rows on")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    output_path = args.output or f"hr_synthetic_{args.rows}.csv"
+    generator = HRDataGenerator(args.sample, seed=args.seed)
+    generator.generate(args.rows, output_path)
+
+    # Check the statistics on a bounded sample of the output
+    generator.compare(pd.read_csv(output_path, nrows=GENERATOR_CHUNK_SIZE))
+
+
+if __name__ == "__main__":
+    main()
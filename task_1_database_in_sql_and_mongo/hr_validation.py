@@ -0,0 +1,134 @@
+"""
+Vectorized Validation for HR Employee Attrition Data
+Checks each chunk read by the import scripts with column-wise pandas masks
+before any database work: numeric coercion, the ranges enforced by the MySQL
+schema (1-4 satisfaction scales and so on), allowed categorical codes,
+non-empty text columns and duplicate EmployeeNumbers
+
+Rows that fail any rule are written to a quarantine CSV with the reasons, so
+only clean rows reach the bulk writers.
+"""
+
+import logging
+import os
+import threading
+
+import pandas as pd
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# CSV file receiving the rows that failed validation, with the reasons
+QUARANTINE_FILE = os.getenv('QUARANTINE_FILE', 'quarantine.csv')
+
+# Serializes quarantine appends from importers running in parallel threads
+QUARANTINE_FILE_LOCK = threading.Lock()
+
+# Inclusive (min, max) range of every integer column; None means unbounded.
+# The bounds mirror the CHECK constraints of the MySQL schema.
+NUMERIC_RANGES = {
+    'EmployeeNumber': (1, None),
+    'Age': (18, 100),
+    'Education': (1, 5),
+    'DistanceFromHome': (0, None),
+    'EmployeeCount': (0, None),
+    'JobLevel': (1, 5),
+    'JobInvolvement': (1, 4),
+    'JobSatisfaction': (1, 4),
+    'StandardHours': (0, None),
+    'DailyRate': (1, None),
+    'HourlyRate': (1, None),
+    'MonthlyIncome': (1, None),
+    'MonthlyRate': (1, None),
+    'PercentSalaryHike': (0, 100),
+    'StockOptionLevel': (0, 3),
+    'PerformanceRating': (1, 4),
+    'YearsAtCompany': (0, None),
+    'YearsInCurrentRole': (0, None),
+    'YearsSinceLastPromotion': (0, None),
+    'YearsWithCurrManager': (0, None),
+    'TotalWorkingYears': (0, None),
+    'NumCompaniesWorked': (0, None),
+    'TrainingTimesLastYear': (0, None),
+    'EnvironmentSatisfaction': (1, 4),
+    'RelationshipSatisfaction': (1, 4),
+    'WorkLifeBalance': (1, 4)
+}
+
+# Allowed values of the categorical columns with a fixed set of codes
+CATEGORICAL_VALUES = {
+    'Attrition': {'Yes', 'No'},
+    'BusinessTravel': {'Non-Travel', 'Travel_Rarely', 'Travel_Frequently'},
+    'Gender': {'Male', 'Female'},
+    'MaritalStatus': {'Single', 'Married', 'Divorced'},
+    'Over18': {'Y', 'N'},
+    'OverTime': {'Yes', 'No'}
+}
+
+# Free-form text columns: any value is accepted as long as one is given, so new
+# departments, job roles or education fields import without a code change
+TEXT_COLUMNS = ['Department', 'EducationField', 'JobRole']
+
+
+def validate_chunk(df: pd.DataFrame, seen_employees: set) -> tuple:
+    """Split a chunk into clean rows and rejected rows with their reasons
+
+    seen_employees holds the EmployeeNumbers accepted from earlier chunks and is
+    updated with the ones accepted from this chunk.
+    """
+    clean = df.copy()
+    failures = {}
+
+    for col, (low, high) in NUMERIC_RANGES.items():
+        values = pd.to_numeric(clean[col], errors='coerce')
+        failures[f"{col} is missing"] = clean[col].isna()
+        failures[f"{col} is not an integer"] = (
+            (values.isna() & clean[col].notna()) | (values.notna() & (values % 1 != 0))
+        )
+        out_of_range = pd.Series(False, index=clean.index)
+        if low is not None:
+            out_of_range |= values < low
+        if high is not None:
+            out_of_range |= values > high
+        failures[f"{col} is out of range"] = out_of_range
+        clean[col] = values
+
+    for col, allowed in CATEGORICAL_VALUES.items():
+        values = clean[col].astype('string').str.strip()
+        failures[f"{col} has an unknown value"] = ~values.isin(allowed)
+        clean[col] = values.astype(object)
+
+    for col in TEXT_COLUMNS:
+        values = clean[col].astype('string').str.strip()
+        failures[f"{col} is missing"] = values.isna() | (values == '')
+        clean[col] = values.astype(object)
+
+    # Keep the first occurrence of an EmployeeNumber, in this chunk or an earlier one
+    # (a set lookup per row stays cheap however many employees were seen before)
+    numbers = clean['EmployeeNumber']
+    seen = pd.Series([n in seen_employees for n in numbers.tolist()], index=clean.index)
+    failures['duplicate EmployeeNumber'] = numbers.duplicated() | seen
+
+    masks = pd.DataFrame(failures).fillna(False).astype(bool)
+    rejected = masks.any(axis=1)
+
+    clean = clean[~rejected].astype({col: 'int64' for col in NUMERIC_RANGES})
+    seen_employees.update(clean['EmployeeNumber'].tolist())
+
+    # Join the names of the failed rules per rejected row
+    failed = masks[rejected]
+    reasons = failed.dot(failed.columns + '; ').str.rstrip('; ')
+    rejects = df[rejected].assign(reasons=reasons)
+
+    return clean, rejects
+
+
+def quarantine_rows(rejects: pd.DataFrame, quarantine_path: str = QUARANTINE_FILE):
+    """Append rejected rows to the quarantine file"""
+    with QUARANTINE_FILE_LOCK:
+        header = not os.path.exists(quarantine_path) or os.path.getsize(quarantine_path) == 0
+        rejects.to_csv(quarantine_path, mode='a', header=header, index_label='source_row')
+    logger.warning(f"Quarantined {len(rejects)} invalid records to {quarantine_path}")
@@ -0,0 +1,7 @@
+-- Indexes behind GET /mysql/employees/changes and /mysql/employees/latest/entry.
+-- updated_at is set on insert and bumped on every update, so one
+-- (updated_at, employee_number) index serves the change feed in cursor order.
+USE hr_attrition_db;
+
+CREATE INDEX idx_employee_updated ON employees(updated_at, employee_number);
+CREATE INDEX idx_employee_created ON employees(created_at, employee_number);
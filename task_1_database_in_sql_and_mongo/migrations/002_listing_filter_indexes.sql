@@ -0,0 +1,15 @@
+-- Composite indexes behind the filters and sorts of GET /mysql/employees/ and
+-- GET /mysql/job_details/. The API only sorts on columns an index starts with
+-- as (column, primary key), like (age, employee_number) and (job_level, job_id).
+USE hr_attrition_db;
+
+-- (attrition, age) serves attrition filters with age ranges or age sorting;
+-- it also covers every lookup the single-column attrition index served
+CREATE INDEX idx_employee_attrition_age ON employees(attrition, age, employee_number);
+DROP INDEX idx_employee_attrition ON employees;
+CREATE INDEX idx_employee_age ON employees(age, employee_number);
+
+-- Department + job role filters, job role + level ranges, level sorting
+CREATE INDEX idx_job_department_role ON job_details(department_id, job_role, employee_number);
+CREATE INDEX idx_job_role_level ON job_details(job_role, job_level);
+CREATE INDEX idx_job_level ON job_details(job_level, job_id);
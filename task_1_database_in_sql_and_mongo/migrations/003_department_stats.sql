@@ -0,0 +1,22 @@
+-- Per-department summary behind GET /mysql/departments/stats. The API adjusts
+-- it in the same transaction as every employee and job detail write; the
+-- import scripts recompute it at the end of a load. Fill it once after
+-- creating it (and whenever it needs repair) with
+-- python mysql_import.py --rebuild-stats
+USE hr_attrition_db;
+
+CREATE TABLE IF NOT EXISTS department_stats (
+    department_id INT PRIMARY KEY,
+    employee_count INT NOT NULL DEFAULT 0,
+    attrition_count INT NOT NULL DEFAULT 0,
+    job_satisfaction_sum INT NOT NULL DEFAULT 0,
+    job_satisfaction_count INT NOT NULL DEFAULT 0,
+    environment_satisfaction_sum INT NOT NULL DEFAULT 0,
+    relationship_satisfaction_sum INT NOT NULL DEFAULT 0,
+    work_life_balance_sum INT NOT NULL DEFAULT 0,
+    satisfaction_count INT NOT NULL DEFAULT 0,
+    monthly_income_sum BIGINT NOT NULL DEFAULT 0,
+    income_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (department_id) REFERENCES departments(department_id) ON DELETE CASCADE
+);
@@ -0,0 +1,67 @@
+-- Append-only change log behind GET /mysql/employees/changes. Paging on
+-- (updated_at, employee_number) missed changes: updated_at has one-second
+-- precision and is taken when a statement runs, not when it commits.
+-- Triggers now add one employee_changes row per insert and per update that
+-- changes a value. Its AUTO_INCREMENT change_id is the feed cursor. The
+-- AUTO_INCREMENT allocation does not hold a lock until commit, so writers do
+-- not queue behind each other; readers stay CHANGE_FEED_LAG_SECONDS behind
+-- changed_at so that transactions still in flight commit before their ids are
+-- passed. Change feed cursors issued before this migration are rejected;
+-- consumers restart by omitting since.
+USE hr_attrition_db;
+
+CREATE TABLE IF NOT EXISTS employee_changes (
+    change_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    employee_number INT NOT NULL,
+    changed_at DATETIME(6) NOT NULL
+);
+
+-- Seed the log with the existing employees in their old feed order
+INSERT INTO employee_changes (employee_number, changed_at)
+SELECT employee_number, COALESCE(updated_at, created_at, NOW(6))
+FROM employees
+ORDER BY updated_at, employee_number;
+
+DROP TRIGGER IF EXISTS update_employee_timestamp;
+DROP TRIGGER IF EXISTS log_employee_insert;
+DROP TRIGGER IF EXISTS log_employee_update;
+
+DELIMITER $$
+
+-- Only a changed value moves updated_at, so a re-import of identical rows
+-- through ON DUPLICATE KEY UPDATE leaves the employee as it was
+CREATE TRIGGER update_employee_timestamp
+BEFORE UPDATE ON employees
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.age <=> OLD.age AND NEW.gender <=> OLD.gender
+            AND NEW.marital_status <=> OLD.marital_status AND NEW.education <=> OLD.education
+            AND NEW.education_field <=> OLD.education_field
+            AND NEW.distance_from_home <=> OLD.distance_from_home AND NEW.over_18 <=> OLD.over_18
+            AND NEW.employee_count <=> OLD.employee_count AND NEW.attrition <=> OLD.attrition) THEN
+        SET NEW.updated_at = CURRENT_TIMESTAMP;
+    END IF;
+END$$
+
+CREATE TRIGGER log_employee_insert
+AFTER INSERT ON employees
+FOR EACH ROW
+BEGIN
+    INSERT INTO employee_changes (employee_number, changed_at) VALUES (NEW.employee_number, SYSDATE(6));
+END$$
+
+-- Logs value changes and explicit updated_at bumps (the API's department moves)
+CREATE TRIGGER log_employee_update
+AFTER UPDATE ON employees
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.updated_at <=> OLD.updated_at AND NEW.age <=> OLD.age AND NEW.gender <=> OLD.gender
+            AND NEW.marital_status <=> OLD.marital_status AND NEW.education <=> OLD.education
+            AND NEW.education_field <=> OLD.education_field
+            AND NEW.distance_from_home <=> OLD.distance_from_home AND NEW.over_18 <=> OLD.over_18
+            AND NEW.employee_count <=> OLD.employee_count AND NEW.attrition <=> OLD.attrition) THEN
+        INSERT INTO employee_changes (employee_number, changed_at) VALUES (NEW.employee_number, SYSDATE(6));
+    END IF;
+END$$
+
+DELIMITER ;
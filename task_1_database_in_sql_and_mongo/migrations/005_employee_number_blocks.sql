@@ -0,0 +1,14 @@
+-- Counter behind the API's employee numbers. employees.employee_number is not
+-- AUTO_INCREMENT, so POST /mysql/employees and /mysql/employees/bulk reserve
+-- a block of numbers here in a short transaction of their own; a reservation
+-- always starts above the current highest employee_number, so numbers loaded
+-- by the import scripts are never handed out again.
+USE hr_attrition_db;
+
+CREATE TABLE IF NOT EXISTS id_blocks (
+    name VARCHAR(50) PRIMARY KEY,
+    next_id BIGINT NOT NULL
+);
+
+INSERT IGNORE INTO id_blocks (name, next_id)
+SELECT 'employees', COALESCE(MAX(employee_number), 0) + 1 FROM employees;
@@ -9,11 +9,15 @@ Authentication Support:
 """
 
 import pandas as pd
-from pymongo import MongoClient
+from pymongo import MongoClient, ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
 from datetime import datetime
 import logging
 import os
+import time
 from dotenv import load_dotenv
+
+from hr_validation import QUARANTINE_FILE, quarantine_rows, validate_chunk
 import numpy as np
 
 # Load environment variables
@@ -39,14 +43,90 @@ MONGODB_CONFIG = {
 # CSV file path
 CSV_FILE_PATH = os.getenv('CSV_FILE_PATH', 'hr_employee_attrition.csv')
 
+# Rows read from the CSV per chunk when streaming
+CSV_CHUNK_SIZE = int(os.getenv('CSV_CHUNK_SIZE', 10000))
+# Read the typed Parquet snapshot (see hr_snapshot.py) instead of the CSV
+USE_SNAPSHOT = os.getenv('USE_SNAPSHOT', 'false').lower() == 'true'
+
+# Source columns every CSV export must provide
+REQUIRED_COLUMNS = [
+    'EmployeeNumber', 'Age', 'Gender', 'MaritalStatus', 'Education',
+    'EducationField', 'DistanceFromHome', 'Over18', 'EmployeeCount',
+    'Attrition', 'Department', 'JobRole', 'JobLevel', 'JobInvolvement',
+    'JobSatisfaction', 'StandardHours', 'BusinessTravel', 'OverTime',
+    'DailyRate', 'HourlyRate', 'MonthlyIncome', 'MonthlyRate',
+    'PercentSalaryHike', 'StockOptionLevel', 'PerformanceRating',
+    'YearsAtCompany', 'YearsInCurrentRole', 'YearsSinceLastPromotion',
+    'YearsWithCurrManager', 'TotalWorkingYears', 'NumCompaniesWorked',
+    'TrainingTimesLastYear', 'EnvironmentSatisfaction',
+    'RelationshipSatisfaction', 'WorkLifeBalance'
+]
+
+# Import settings
+# 'full' inserts every employee, 'incremental' upserts only employees whose
+# content hash changed since the last import
+IMPORT_MODE = os.getenv('MONGODB_IMPORT_MODE', 'full')
+# Employee documents per unordered insert_many / bulk_write call
+BATCH_SIZE = int(os.getenv('MONGODB_BATCH_SIZE', 1000))
+# Delete employees missing from the source during an incremental import
+DELETE_MISSING = os.getenv('SYNC_DELETE_MISSING', 'false').lower() == 'true'
+# Build secondary indexes after the data is loaded instead of on every insert
+BULK_LOAD = os.getenv('BULK_LOAD', 'false').lower() == 'true'
+
+# Non-unique employee indexes, deferred until after the load in bulk-load mode
+EMPLOYEE_SECONDARY_INDEXES = [
+    'attrition_info.status',
+    'job_info.department',
+    'personal_info.age',
+    'compensation.monthly_income'
+]
+
+# CSV columns converted to int / kept as text when building employee documents
+EMPLOYEE_INT_COLUMNS = [
+    'EmployeeNumber', 'Age', 'Education', 'DistanceFromHome', 'EmployeeCount',
+    'JobLevel', 'JobInvolvement', 'JobSatisfaction', 'StandardHours',
+    'DailyRate', 'HourlyRate', 'MonthlyIncome', 'MonthlyRate',
+    'PercentSalaryHike', 'StockOptionLevel', 'PerformanceRating',
+    'YearsAtCompany', 'YearsInCurrentRole', 'YearsSinceLastPromotion',
+    'YearsWithCurrManager', 'TotalWorkingYears', 'NumCompaniesWorked',
+    'TrainingTimesLastYear', 'EnvironmentSatisfaction',
+    'RelationshipSatisfaction', 'WorkLifeBalance'
+]
+EMPLOYEE_STRING_COLUMNS = [
+    'Gender', 'MaritalStatus', 'EducationField', 'Over18', 'Department',
+    'JobRole', 'BusinessTravel', 'OverTime', 'Attrition'
+]
+
+
+def compute_content_hashes(df: pd.DataFrame) -> pd.Series:
+    """Hash the source columns of each row to detect new or changed employees"""
+    # Normalize dtypes first so a column read as float in one chunk and int in
+    # another still hashes the same
+    normalized = pd.DataFrame({
+        col: df[col].astype('int64') if pd.api.types.is_numeric_dtype(df[col]) else df[col].astype(str)
+        for col in REQUIRED_COLUMNS
+    })
+    hashes = pd.util.hash_pandas_object(normalized, index=False)
+    return hashes.map('{:016x}'.format)
+
 
 class MongoDBDataImporter:
     """Class to handle data import for HR Attrition dataset into MongoDB"""
     
-    def __init__(self):
+    def __init__(self, mode: str = IMPORT_MODE, batch_size: int = BATCH_SIZE,
+                 bulk_load: bool = BULK_LOAD):
         """Initialize MongoDB connection"""
         self.client = None
         self.db = None
+        self.department_stats = {}
+        self.mode = mode
+        self.batch_size = batch_size
+        self.bulk_load = bulk_load
+        self.load_start = None
+        self.seen_employees = set()
+        self.sync_counts = {'new': 0, 'changed': 0, 'unchanged': 0, 'failed': 0}
+        self.validated_employees = set()
+        self.quarantine_file = QUARANTINE_FILE
         
     def connect_mongodb(self):
         """Establish MongoDB connection"""
@@ -81,7 +161,7 @@ class MongoDBDataImporter:
     def clean_collections(self):
         """Clear existing data from MongoDB collections"""
         try:
-            collections = ['employees', 'departments', 'attrition_predictions']
+            collections = ['employees', 'departments', 'attrition_predictions', 'import_manifest']
             
             for collection in collections:
                 result = self.db[collection].delete_many({})
@@ -91,25 +171,97 @@ class MongoDBDataImporter:
             logger.error(f"Error clearing MongoDB collections: {e}")
             raise
     
-    def create_indexes(self):
+    def create_indexes(self, include_secondary: bool = True):
         """Create indexes for better query performance"""
         try:
             # Employees collection indexes
             self.db.employees.create_index([("employee_number", 1)], unique=True)
-            self.db.employees.create_index([("attrition_info.status", 1)])
-            self.db.employees.create_index([("job_info.department", 1)])
-            self.db.employees.create_index([("personal_info.age", 1)])
-            self.db.employees.create_index([("compensation.monthly_income", 1)])
+            if include_secondary:
+                for field in EMPLOYEE_SECONDARY_INDEXES:
+                    self.db.employees.create_index([(field, 1)])
             
             # Departments collection index
             self.db.departments.create_index([("department_name", 1)], unique=True)
             
+            # Incremental import manifest index
+            self.db.import_manifest.create_index([("employee_number", 1)], unique=True)
+            
             logger.info("Created MongoDB indexes successfully")
             
         except Exception as e:
             logger.error(f"Error creating indexes: {e}")
             raise
     
+    def prepare_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fill missing values and validate required columns"""
+        # Handle any NaN values
+        df = df.fillna({
+            'NumCompaniesWorked': 0,
+            'YearsInCurrentRole': 0,
+            'YearsSinceLastPromotion': 0,
+            'YearsWithCurrManager': 0,
+            'TrainingTimesLastYear': 0
+        })
+        
+        # Validate required columns
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+        
+        # Quarantine rows that fail the type, range, allowed value or duplicate checks
+        df, rejects = validate_chunk(df, self.validated_employees)
+        if len(rejects):
+            quarantine_rows(rejects, self.quarantine_file)
+        
+        return df
+    
+    def drop_secondary_indexes(self):
+        """Drop the non-unique employee indexes ahead of a bulk load"""
+        try:
+            existing = self.db.employees.index_information()
+            for field in EMPLOYEE_SECONDARY_INDEXES:
+                index_name = f"{field}_1"
+                if index_name in existing:
+                    self.db.employees.drop_index(index_name)
+                    logger.info(f"Dropped index '{index_name}' for bulk load")
+            
+        except Exception as e:
+            logger.error(f"Error dropping indexes: {e}")
+            raise
+    
+    def validate_bulk_load(self) -> bool:
+        """Check indexes and document structure after a bulk load"""
+        try:
+            valid = True
+            
+            # Every employee index must be back in place
+            existing = self.db.employees.index_information()
+            expected = ['employee_number_1'] + [f"{field}_1" for field in EMPLOYEE_SECONDARY_INDEXES]
+            missing_indexes = [name for name in expected if name not in existing]
+            if missing_indexes:
+                valid = False
+                logger.warning(f"Missing indexes after bulk load: {missing_indexes}")
+            
+            # Every employee document must carry all embedded sections
+            sections = [
+                'employee_number', 'personal_info', 'job_info', 'compensation',
+                'performance', 'satisfaction_scores', 'attrition_info'
+            ]
+            incomplete = self.db.employees.count_documents(
+                {'$or': [{section: {'$exists': False}} for section in sections]}
+            )
+            if incomplete:
+                valid = False
+                logger.warning(f"{incomplete} employee documents are missing required sections")
+            
+            if valid:
+                logger.info("Bulk load validation passed")
+            return valid
+            
+        except Exception as e:
+            logger.error(f"Error validating bulk load: {e}")
+            raise
+    
     def load_csv_data(self) -> pd.DataFrame:
         """Load and preprocess CSV data"""
         try:
@@ -120,69 +272,102 @@ class MongoDBDataImporter:
             df = pd.read_csv(CSV_FILE_PATH)
             logger.info(f"Loaded {len(df)} records from {CSV_FILE_PATH}")
             
-            # Handle any NaN values
-            df = df.fillna({
-                'NumCompaniesWorked': 0,
-                'YearsInCurrentRole': 0,
-                'YearsSinceLastPromotion': 0,
-                'YearsWithCurrManager': 0,
-                'TrainingTimesLastYear': 0
-            })
-            
-            # Validate required columns
-            required_columns = [
-                'EmployeeNumber', 'Age', 'Gender', 'MaritalStatus', 'Education',
-                'EducationField', 'DistanceFromHome', 'Over18', 'EmployeeCount',
-                'Attrition', 'Department', 'JobRole', 'JobLevel', 'JobInvolvement',
-                'JobSatisfaction', 'StandardHours', 'BusinessTravel', 'OverTime',
-                'DailyRate', 'HourlyRate', 'MonthlyIncome', 'MonthlyRate',
-                'PercentSalaryHike', 'StockOptionLevel', 'PerformanceRating',
-                'YearsAtCompany', 'YearsInCurrentRole', 'YearsSinceLastPromotion',
-                'YearsWithCurrManager', 'TotalWorkingYears', 'NumCompaniesWorked',
-                'TrainingTimesLastYear', 'EnvironmentSatisfaction', 
-                'RelationshipSatisfaction', 'WorkLifeBalance'
-            ]
-            
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                raise ValueError(f"Missing required columns: {missing_columns}")
+            return self.prepare_data(df)
             
-            return df
+        except Exception as e:
+            logger.error(f"Error loading CSV file: {e}")
+            raise
+    
+    def iter_csv_chunks(self, chunk_size: int = CSV_CHUNK_SIZE):
+        """Stream the CSV in fixed-size, preprocessed chunks"""
+        try:
+            if USE_SNAPSHOT:
+                # Typed Parquet snapshot built by hr_snapshot.py; skips CSV text parsing
+                from hr_snapshot import SNAPSHOT_PATH, iter_snapshot_chunks
+                source = SNAPSHOT_PATH
+                reader = iter_snapshot_chunks(chunk_size)
+            else:
+                # Check if file exists
+                if not os.path.exists(CSV_FILE_PATH):
+                    raise FileNotFoundError(f"CSV file not found: {CSV_FILE_PATH}")
+                source = CSV_FILE_PATH
+                reader = pd.read_csv(CSV_FILE_PATH, chunksize=chunk_size)
+            
+            loaded_count = 0
+            for chunk in reader:
+                # Index rows by their position in the source for the quarantine file
+                chunk.index = pd.RangeIndex(loaded_count, loaded_count + len(chunk))
+                loaded_count += len(chunk)
+                logger.info(f"Loaded {loaded_count} records from {source}...")
+                chunk = self.prepare_data(chunk)
+                if len(chunk):
+                    yield chunk
             
         except Exception as e:
             logger.error(f"Error loading CSV file: {e}")
             raise
     
-    def insert_departments(self, df: pd.DataFrame):
+    def collect_department_stats(self, df: pd.DataFrame):
+        """Accumulate per-department counts and sums from a chunk"""
+        sum_columns = [
+            'JobSatisfaction', 'EnvironmentSatisfaction', 'RelationshipSatisfaction',
+            'WorkLifeBalance', 'MonthlyIncome'
+        ]
+        df = df.assign(AttritionCount=(df['Attrition'] == 'Yes').astype(int))
+        grouped = df.groupby('Department', sort=False)
+        sums = grouped[sum_columns + ['AttritionCount']].sum()
+        sizes = grouped.size()
+        
+        for dept_name in sums.index:
+            stats = self.department_stats.setdefault(
+                dept_name,
+                {'employee_count': 0, 'attrition_count': 0, **{col: 0 for col in sum_columns}}
+            )
+            stats['employee_count'] += int(sizes[dept_name])
+            stats['attrition_count'] += int(sums.at[dept_name, 'AttritionCount'])
+            for col in sum_columns:
+                stats[col] += int(sums.at[dept_name, col])
+    
+    def insert_departments(self, df: pd.DataFrame = None):
         """Insert department statistics into MongoDB"""
         try:
+            # Without a DataFrame, use the stats accumulated while streaming
+            if df is not None:
+                self.collect_department_stats(df)
+            
             departments = []
             
-            for dept_name in df['Department'].unique():
-                dept_data = df[df['Department'] == dept_name]
-                attrition_count = (dept_data['Attrition'] == 'Yes').sum()
-                total_count = len(dept_data)
+            for dept_name, stats in self.department_stats.items():
+                total_count = stats['employee_count']
+                attrition_count = stats['attrition_count']
                 attrition_rate = attrition_count / total_count if total_count > 0 else 0
                 
                 dept_doc = {
                     'department_name': dept_name,
                     'employee_count': total_count,
-                    'attrition_count': int(attrition_count),
+                    'attrition_count': attrition_count,
                     'avg_attrition_rate': round(attrition_rate, 3),
                     'avg_satisfaction': {
-                        'job': round(dept_data['JobSatisfaction'].mean(), 2),
-                        'environment': round(dept_data['EnvironmentSatisfaction'].mean(), 2),
-                        'relationship': round(dept_data['RelationshipSatisfaction'].mean(), 2),
-                        'work_life_balance': round(dept_data['WorkLifeBalance'].mean(), 2)
+                        'job': round(stats['JobSatisfaction'] / total_count, 2),
+                        'environment': round(stats['EnvironmentSatisfaction'] / total_count, 2),
+                        'relationship': round(stats['RelationshipSatisfaction'] / total_count, 2),
+                        'work_life_balance': round(stats['WorkLifeBalance'] / total_count, 2)
                     },
-                    'avg_monthly_income': round(dept_data['MonthlyIncome'].mean(), 2),
+                    'avg_monthly_income': round(stats['MonthlyIncome'] / total_count, 2),
                     'last_updated': datetime.now()
                 }
                 
                 departments.append(dept_doc)
             
             # Insert all departments
-            if departments:
+            if departments and self.mode == 'incremental':
+                # Departments may already exist, so replace them by name
+                self.db.departments.bulk_write([
+                    ReplaceOne({'department_name': doc['department_name']}, doc, upsert=True)
+                    for doc in departments
+                ], ordered=False)
+                logger.info(f"Upserted {len(departments)} departments")
+            elif departments:
                 result = self.db.departments.insert_many(departments)
                 logger.info(f"Inserted {len(result.inserted_ids)} departments")
             
@@ -190,86 +375,100 @@ class MongoDBDataImporter:
             logger.error(f"Error inserting departments: {e}")
             raise
     
+    def build_employee_documents(self, df: pd.DataFrame) -> list:
+        """Build nested employee documents from DataFrame columns"""
+        # Convert each column once; tolist() yields native Python types for BSON
+        c = {col: df[col].astype('int64').tolist() for col in EMPLOYEE_INT_COLUMNS}
+        c.update({col: df[col].tolist() for col in EMPLOYEE_STRING_COLUMNS})
+        now = datetime.now()
+        
+        return [
+            {
+                'employee_number': c['EmployeeNumber'][i],
+                'personal_info': {
+                    'age': c['Age'][i],
+                    'gender': c['Gender'][i],
+                    'marital_status': c['MaritalStatus'][i],
+                    'education': {
+                        'level': c['Education'][i],
+                        'field': c['EducationField'][i]
+                    },
+                    'distance_from_home': c['DistanceFromHome'][i],
+                    'over_18': c['Over18'][i]
+                },
+                'job_info': {
+                    'department': c['Department'][i],
+                    'role': c['JobRole'][i],
+                    'level': c['JobLevel'][i],
+                    'involvement': c['JobInvolvement'][i],
+                    'satisfaction': c['JobSatisfaction'][i],
+                    'standard_hours': c['StandardHours'][i],
+                    'business_travel': c['BusinessTravel'][i],
+                    'overtime': c['OverTime'][i]
+                },
+                'compensation': {
+                    'daily_rate': c['DailyRate'][i],
+                    'hourly_rate': c['HourlyRate'][i],
+                    'monthly_income': c['MonthlyIncome'][i],
+                    'monthly_rate': c['MonthlyRate'][i],
+                    'percent_salary_hike': c['PercentSalaryHike'][i],
+                    'stock_option_level': c['StockOptionLevel'][i]
+                },
+                'performance': {
+                    'rating': c['PerformanceRating'][i],
+                    'years_at_company': c['YearsAtCompany'][i],
+                    'years_in_current_role': c['YearsInCurrentRole'][i],
+                    'years_since_last_promotion': c['YearsSinceLastPromotion'][i],
+                    'years_with_current_manager': c['YearsWithCurrManager'][i],
+                    'total_working_years': c['TotalWorkingYears'][i],
+                    'num_companies_worked': c['NumCompaniesWorked'][i],
+                    'training_times_last_year': c['TrainingTimesLastYear'][i]
+                },
+                'satisfaction_scores': {
+                    'environment': c['EnvironmentSatisfaction'][i],
+                    'job': c['JobSatisfaction'][i],
+                    'relationship': c['RelationshipSatisfaction'][i],
+                    'work_life_balance': c['WorkLifeBalance'][i]
+                },
+                'attrition_info': {
+                    'status': c['Attrition'][i],
+                    'risk_score': None,  # Filled in by mongodb_risk_scoring.py
+                    'last_risk_assessment': None
+                },
+                'metadata': {
+                    'created_at': now,
+                    'updated_at': now,
+                    'employee_count': c['EmployeeCount'][i],
+                    'data_source': 'initial_import'
+                }
+            }
+            for i in range(len(df))
+        ]
+    
     def insert_employees(self, df: pd.DataFrame):
         """Insert employee data into MongoDB"""
         try:
-            documents = []
-            batch_size = 100
-            
-            for idx, row in df.iterrows():
-                # Create employee document with embedded structure
-                doc = {
-                    'employee_number': int(row['EmployeeNumber']),
-                    'personal_info': {
-                        'age': int(row['Age']),
-                        'gender': row['Gender'],
-                        'marital_status': row['MaritalStatus'],
-                        'education': {
-                            'level': int(row['Education']),
-                            'field': row['EducationField']
-                        },
-                        'distance_from_home': int(row['DistanceFromHome']),
-                        'over_18': row['Over18']
-                    },
-                    'job_info': {
-                        'department': row['Department'],
-                        'role': row['JobRole'],
-                        'level': int(row['JobLevel']),
-                        'involvement': int(row['JobInvolvement']),
-                        'satisfaction': int(row['JobSatisfaction']),
-                        'standard_hours': int(row['StandardHours']),
-                        'business_travel': row['BusinessTravel'],
-                        'overtime': row['OverTime']
-                    },
-                    'compensation': {
-                        'daily_rate': int(row['DailyRate']),
-                        'hourly_rate': int(row['HourlyRate']),
-                        'monthly_income': int(row['MonthlyIncome']),
-                        'monthly_rate': int(row['MonthlyRate']),
-                        'percent_salary_hike': int(row['PercentSalaryHike']),
-                        'stock_option_level': int(row['StockOptionLevel'])
-                    },
-                    'performance': {
-                        'rating': int(row['PerformanceRating']),
-                        'years_at_company': int(row['YearsAtCompany']),
-                        'years_in_current_role': int(row['YearsInCurrentRole']),
-                        'years_since_last_promotion': int(row['YearsSinceLastPromotion']),
-                        'years_with_current_manager': int(row['YearsWithCurrManager']),
-                        'total_working_years': int(row['TotalWorkingYears']),
-                        'num_companies_worked': int(row['NumCompaniesWorked']),
-                        'training_times_last_year': int(row['TrainingTimesLastYear'])
-                    },
-                    'satisfaction_scores': {
-                        'environment': int(row['EnvironmentSatisfaction']),
-                        'job': int(row['JobSatisfaction']),
-                        'relationship': int(row['RelationshipSatisfaction']),
-                        'work_life_balance': int(row['WorkLifeBalance'])
-                    },
-                    'attrition_info': {
-                        'status': row['Attrition'],
-                        'risk_score': None,  # To be calculated by ML model
-                        'last_risk_assessment': None
-                    },
-                    'metadata': {
-                        'created_at': datetime.now(),
-                        'updated_at': datetime.now(),
-                        'employee_count': int(row['EmployeeCount']),
-                        'data_source': 'initial_import'
-                    }
-                }
-                
-                documents.append(doc)
-                
-                # Insert in batches for better performance
-                if len(documents) >= batch_size:
-                    result = self.db.employees.insert_many(documents)
-                    logger.info(f"Inserted batch of {len(result.inserted_ids)} employees (total: {idx + 1})")
-                    documents = []
-            
-            # Insert remaining documents
-            if documents:
-                result = self.db.employees.insert_many(documents)
-                logger.info(f"Inserted final batch of {len(result.inserted_ids)} employees")
+            documents = self.build_employee_documents(df)
+            inserted_count = 0
+            error_count = 0
+            
+            # Unordered batches let the server apply writes without stopping at the first error
+            for start in range(0, len(documents), self.batch_size):
+                batch = documents[start:start + self.batch_size]
+                try:
+                    result = self.db.employees.insert_many(batch, ordered=False)
+                    inserted_count += len(result.inserted_ids)
+                except BulkWriteError as e:
+                    inserted_count += e.details['nInserted']
+                    error_count += len(e.details['writeErrors'])
+                    logger.warning(
+                        f"Batch at offset {start}: {len(e.details['writeErrors'])} documents "
+                        f"rejected (first error: {e.details['writeErrors'][0]['errmsg']})"
+                    )
+                logger.info(f"Inserted batch of {len(batch)} employees (total: {inserted_count})")
+            
+            if error_count > 0:
+                logger.warning(f"Failed to insert {error_count} employees")
             
             total_count = self.db.employees.count_documents({})
             logger.info(f"Total employees in MongoDB: {total_count}")
@@ -278,6 +477,108 @@ class MongoDBDataImporter:
             logger.error(f"Error inserting employees: {e}")
             raise
     
+    def build_employee_upsert(self, doc: dict) -> dict:
+        """Build the upsert update for an employee document"""
+        # Keep the creation time and any risk assessment of existing employees
+        return {
+            '$set': {
+                'personal_info': doc['personal_info'],
+                'job_info': doc['job_info'],
+                'compensation': doc['compensation'],
+                'performance': doc['performance'],
+                'satisfaction_scores': doc['satisfaction_scores'],
+                'attrition_info.status': doc['attrition_info']['status'],
+                'metadata.updated_at': doc['metadata']['updated_at'],
+                'metadata.employee_count': doc['metadata']['employee_count'],
+                'metadata.data_source': 'incremental_import'
+            },
+            '$setOnInsert': {
+                'attrition_info.risk_score': None,
+                'attrition_info.last_risk_assessment': None,
+                'metadata.created_at': doc['metadata']['created_at']
+            }
+        }
+    
+    def upsert_employees(self, df: pd.DataFrame):
+        """Upsert only new or changed employees, tracked by content hash"""
+        try:
+            hashes = compute_content_hashes(df).tolist()
+            employee_numbers = df['EmployeeNumber'].astype('int64').tolist()
+            self.seen_employees.update(employee_numbers)
+            
+            stored = {
+                entry['employee_number']: entry['content_hash']
+                for entry in self.db.import_manifest.find(
+                    {'employee_number': {'$in': employee_numbers}},
+                    {'_id': 0, 'employee_number': 1, 'content_hash': 1}
+                )
+            }
+            changed_mask = [stored.get(n) != h for n, h in zip(employee_numbers, hashes)]
+            changed_hashes = [h for h, is_changed in zip(hashes, changed_mask) if is_changed]
+            documents = self.build_employee_documents(df[changed_mask])
+            self.sync_counts['unchanged'] += len(df) - len(documents)
+            
+            for start in range(0, len(documents), self.batch_size):
+                batch = documents[start:start + self.batch_size]
+                batch_hashes = changed_hashes[start:start + self.batch_size]
+                failed = set()
+                try:
+                    self.db.employees.bulk_write([
+                        UpdateOne({'employee_number': doc['employee_number']},
+                                  self.build_employee_upsert(doc), upsert=True)
+                        for doc in batch
+                    ], ordered=False)
+                except BulkWriteError as e:
+                    failed = {error['index'] for error in e.details['writeErrors']}
+                    logger.warning(
+                        f"Batch at offset {start}: {len(failed)} documents rejected "
+                        f"(first error: {e.details['writeErrors'][0]['errmsg']})"
+                    )
+                
+                # Only record hashes for employees that were actually written
+                manifest_updates = [
+                    UpdateOne({'employee_number': doc['employee_number']},
+                              {'$set': {'content_hash': content_hash}}, upsert=True)
+                    for i, (doc, content_hash) in enumerate(zip(batch, batch_hashes))
+                    if i not in failed
+                ]
+                if manifest_updates:
+                    self.db.import_manifest.bulk_write(manifest_updates, ordered=False)
+                
+                written = [doc['employee_number'] for i, doc in enumerate(batch) if i not in failed]
+                self.sync_counts['changed'] += sum(1 for n in written if n in stored)
+                self.sync_counts['new'] += sum(1 for n in written if n not in stored)
+                self.sync_counts['failed'] += len(failed)
+            
+            logger.info(
+                f"Synced chunk: {len(documents)} new or changed, "
+                f"{len(df) - len(documents)} unchanged employees"
+            )
+            
+        except Exception as e:
+            logger.error(f"Error upserting employees: {e}")
+            raise
+    
+    def delete_missing_employees(self):
+        """Delete employees that are no longer present in the source"""
+        try:
+            missing = [
+                entry['employee_number']
+                for entry in self.db.import_manifest.find({}, {'_id': 0, 'employee_number': 1})
+                if entry['employee_number'] not in self.seen_employees
+            ]
+            
+            for start in range(0, len(missing), self.batch_size):
+                batch = missing[start:start + self.batch_size]
+                self.db.employees.delete_many({'employee_number': {'$in': batch}})
+                self.db.import_manifest.delete_many({'employee_number': {'$in': batch}})
+            
+            logger.info(f"Deleted {len(missing)} employees missing from the source")
+            
+        except Exception as e:
+            logger.error(f"Error deleting missing employees: {e}")
+            raise
+    
     def verify_data(self):
         """Verify data insertion in MongoDB"""
         try:
@@ -355,6 +656,61 @@ class MongoDBDataImporter:
             self.client.close()
             logger.info("MongoDB connection closed")
     
+    def start_import(self):
+        """Create indexes before the first chunk is loaded"""
+        # Every import starts a new quarantine file
+        if os.path.exists(self.quarantine_file):
+            os.remove(self.quarantine_file)
+        
+        # Create indexes; a bulk load postpones the secondary ones
+        logger.info("Creating indexes...")
+        if self.bulk_load:
+            self.drop_secondary_indexes()
+        self.create_indexes(include_secondary=not self.bulk_load)
+        
+        self.load_start = time.perf_counter()
+    
+    def load_chunk(self, chunk: pd.DataFrame):
+        """Load one preprocessed CSV chunk into the employees collection"""
+        # Insert employees
+        if self.mode == 'incremental':
+            logger.info("Syncing changed employee documents (incremental mode)...")
+            self.upsert_employees(chunk)
+        else:
+            logger.info("Inserting employee documents...")
+            self.insert_employees(chunk)
+        self.collect_department_stats(chunk)
+    
+    def finish_import(self):
+        """Write departments, sync deletions and rebuild indexes after the last chunk"""
+        # Insert departments once every chunk has been counted
+        logger.info("Inserting department statistics...")
+        self.insert_departments()
+        
+        if self.mode == 'incremental':
+            logger.info(
+                "Incremental import: {new} new, {changed} changed, "
+                "{unchanged} unchanged, {failed} failed".format(**self.sync_counts)
+            )
+            if DELETE_MISSING:
+                self.delete_missing_employees()
+        
+        if self.bulk_load:
+            insert_time = time.perf_counter() - self.load_start
+            
+            # Rebuild the secondary indexes in one pass over the loaded data
+            logger.info("Rebuilding secondary indexes...")
+            index_start = time.perf_counter()
+            self.create_indexes()
+            index_time = time.perf_counter() - index_start
+            
+            self.validate_bulk_load()
+            logger.info(
+                f"Bulk load timings: inserts {insert_time:.2f}s, "
+                f"index rebuild {index_time:.2f}s "
+                f"({index_time / (insert_time + index_time) * 100:.1f}% of load time)"
+            )
+    
     def run_import(self):
         """Main method to run the complete import process"""
         try:
@@ -367,21 +723,14 @@ class MongoDBDataImporter:
                 logger.info("Cleaning existing collections...")
                 self.clean_collections()
             
-            # Create indexes
-            logger.info("Creating indexes...")
-            self.create_indexes()
+            self.start_import()
             
-            # Load CSV data
-            logger.info("Loading CSV data...")
-            df = self.load_csv_data()
+            # Stream CSV data chunk by chunk so memory stays flat
+            logger.info("Streaming CSV data...")
+            for chunk in self.iter_csv_chunks():
+                self.load_chunk(chunk)
             
-            # Insert departments
-            logger.info("Inserting department statistics...")
-            self.insert_departments(df)
-            
-            # Insert employees
-            logger.info("Inserting employee documents...")
-            self.insert_employees(df)
+            self.finish_import()
             
             # Verify insertion
             logger.info("Verifying data insertion...")
@@ -396,7 +745,6 @@ class MongoDBDataImporter:
         finally:
             self.close_connection()
 
-
 def main():
     """Main execution function"""
     print("=" * 60)
@@ -0,0 +1,222 @@
+"""
+Attrition Risk Scoring Job for the MongoDB Employees Collection
+This script fills in attrition_info.risk_score, which mongodb_import.py leaves
+empty, using the rules of the MySQL calculate_attrition_risk procedure
+
+Employees are read in batches with only the scored fields projected and scored
+column by column with numpy. The scores are written back with unordered
+bulk_write batches of UpdateOne $set. A watermark on metadata.updated_at is
+saved after every batch, so a later run only rescores employees imported or
+changed since, and an interrupted run picks up where it stopped.
+
+Usage:
+    python mongodb_risk_scoring.py          # score employees changed since the last run
+    python mongodb_risk_scoring.py --full   # rescore every employee
+"""
+
+import argparse
+import logging
+import os
+import time
+from datetime import datetime
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from mongodb_import import MongoDBDataImporter
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Employee documents scored and written per bulk_write call
+SCORING_BATCH_SIZE = int(os.getenv('RISK_SCORING_BATCH_SIZE', 5000))
+
+# Document of the job_watermarks collection holding this job's progress
+WATERMARK_ID = 'attrition_risk_scoring'
+
+# Rules of calculate_attrition_risk: (factor, points, field, test on the field's column).
+# A missing field fails every test, like the procedure's NULL variables.
+RISK_RULES = [
+    ('Low Job Satisfaction', 25, 'satisfaction_scores.job', lambda col: col <= 2),
+    ('Low Environment Satisfaction', 20, 'satisfaction_scores.environment', lambda col: col <= 2),
+    ('Poor Work-Life Balance', 20, 'satisfaction_scores.work_life_balance', lambda col: col <= 2),
+    ('Long Time Without Promotion', 15, 'performance.years_since_last_promotion', lambda col: col >= 5),
+    ('Frequent Overtime', 10, 'job_info.overtime', lambda col: col == 'Yes'),
+    ('Below Average Income', 10, 'compensation.monthly_income', lambda col: col < 3000),
+]
+STRING_FIELDS = {'job_info.overtime'}
+
+# Lowest score of each risk level, highest level first; anything below is LOW
+RISK_LEVELS = [('HIGH', 60), ('MEDIUM', 30)]
+
+# Fields read from each employee document
+SCORED_FIELDS = [field for _, _, field, _ in RISK_RULES] + ['metadata.updated_at']
+
+
+def score_documents(documents: list) -> dict:
+    """Score a batch of employee documents; returns _id, score, level and factor columns"""
+    df = pd.json_normalize(documents).reindex(columns=['_id', *SCORED_FIELDS])
+
+    # One boolean column per rule, then the score as a matrix-vector product
+    matches = np.column_stack([
+        test(df[field] if field in STRING_FIELDS else pd.to_numeric(df[field], errors='coerce')).to_numpy(dtype=bool)
+        for _, _, field, test in RISK_RULES
+    ])
+    points = np.array([rule_points for _, rule_points, _, _ in RISK_RULES])
+    scores = matches @ points
+    levels = np.select([scores >= threshold for _, threshold in RISK_LEVELS],
+                       [name for name, _ in RISK_LEVELS], default='LOW')
+    labels = np.array([factor for factor, _, _, _ in RISK_RULES])
+
+    return {
+        '_id': df['_id'].tolist(),
+        'risk_score': scores.tolist(),
+        'risk_level': levels.tolist(),
+        'risk_factors': [labels[row].tolist() for row in matches],
+    }
+
+
+class RiskScoringJob:
+    """Scores employee documents and writes the results back in bulk"""
+
+    def __init__(self, batch_size: int = SCORING_BATCH_SIZE):
+        self.importer = MongoDBDataImporter()
+        self.db = None
+        self.batch_size = batch_size
+        self.counts = {'scored': 0, 'failed': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
+
+    def connect(self):
+        """Connect with the import script's MongoDB settings"""
+        self.importer.connect_mongodb()
+        self.db = self.importer.db
+        # Serves the (metadata.updated_at, _id) scan of every run
+        self.db.employees.create_index([('metadata.updated_at', 1), ('_id', 1)])
+
+    def load_watermark(self):
+        """Return the (updated_at, _id) of the last scored employee, or None"""
+        state = self.db.job_watermarks.find_one({'_id': WATERMARK_ID})
+        if state and state.get('updated_at') is not None:
+            return state['updated_at'], state['last_id']
+        return None
+
+    def save_watermark(self, updated_at, last_id):
+        self.db.job_watermarks.update_one(
+            {'_id': WATERMARK_ID},
+            {'$set': {'updated_at': updated_at, 'last_id': last_id, 'last_run': datetime.now()}},
+            upsert=True
+        )
+
+    def changed_query(self, watermark) -> dict:
+        """Employees whose metadata.updated_at is past the watermark, ties broken by _id;
+        every employee, with or without updated_at, when there is no watermark"""
+        if not watermark:
+            return {}
+        updated_at, last_id = watermark
+        return {'$or': [
+            {'metadata.updated_at': {'$gt': updated_at}},
+            {'metadata.updated_at': updated_at, '_id': {'$gt': last_id}},
+        ]}
+
+    def write_scores(self, scored: dict) -> set:
+        """Write one scored batch with an unordered bulk_write; returns the batch positions of failed updates"""
+        assessed_at = datetime.now()
+        requests = [
+            UpdateOne({'_id': _id}, {'$set': {
+                'attrition_info.risk_score': score,
+                'attrition_info.risk_level': level,
+                'attrition_info.risk_factors': factors,
+                'attrition_info.last_risk_assessment': assessed_at,
+            }})
+            for _id, score, level, factors in zip(
+                scored['_id'], scored['risk_score'], scored['risk_level'], scored['risk_factors']
+            )
+        ]
+        try:
+            self.db.employees.bulk_write(requests, ordered=False)
+            return set()
+        except BulkWriteError as e:
+            errors = e.details['writeErrors']
+            logger.warning(
+                f"{len(errors)} risk score updates rejected "
+                f"(first error: {errors[0]['errmsg']})"
+            )
+            return {error['index'] for error in errors}
+
+    def run(self, full: bool = False):
+        """Score every employee changed since the watermark (all of them with full=True)"""
+        try:
+            self.connect()
+            watermark = None if full else self.load_watermark()
+            if watermark:
+                logger.info(f"Scoring employees updated after {watermark[0]}")
+            else:
+                logger.info("Scoring all employees")
+
+            start_time = time.perf_counter()
+            cursor = (
+                self.db.employees.find(self.changed_query(watermark), SCORED_FIELDS, batch_size=self.batch_size)
+                .sort([('metadata.updated_at', 1), ('_id', 1)])
+            )
+            advance = True
+            while True:
+                documents = list(islice(cursor, self.batch_size))
+                if not documents:
+                    break
+
+                scored = score_documents(documents)
+                failed = self.write_scores(scored)
+                self.counts['scored'] += len(documents) - len(failed)
+                self.counts['failed'] += len(failed)
+                for position, level in enumerate(scored['risk_level']):
+                    if position not in failed:
+                        self.counts[level] += 1
+
+                # Keep the watermark before a batch with failures so the next run retries it
+                advance = advance and not failed
+                # Employees without updated_at sort first and cannot be a watermark
+                last = documents[-1]
+                last_updated_at = last.get('metadata', {}).get('updated_at')
+                if advance and last_updated_at is not None:
+                    self.save_watermark(last_updated_at, last['_id'])
+                logger.info(f"Scored {self.counts['scored']} employees...")
+
+            elapsed = time.perf_counter() - start_time
+            rate = self.counts['scored'] / elapsed if elapsed > 0 else 0
+            logger.info(
+                "Risk scoring finished: {scored} scored, {failed} failed "
+                "(HIGH {HIGH}, MEDIUM {MEDIUM}, LOW {LOW})".format(**self.counts)
+                + f" in {elapsed:.2f}s ({rate:.0f} employees/sec)"
+            )
+            return self.counts
+
+        except Exception as e:
+            logger.error(f"Risk scoring failed: {e}")
+            raise
+
+        finally:
+            self.importer.close_connection()
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Fill attrition_info.risk_score for MongoDB employees")
+    parser.add_argument('--full', action='store_true',
+                        help="Rescore every employee instead of those changed since the last run")
+    args = parser.parse_args()
+
+    RiskScoringJob().run(full=args.full)
+
+
+if __name__ == "__main__":
+    main()
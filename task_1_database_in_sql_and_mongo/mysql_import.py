@@ -7,10 +7,16 @@ import pandas as pd
 import mysql.connector
 from mysql.connector import Error
 from datetime import datetime
+import argparse
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+from hr_validation import QUARANTINE_FILE, quarantine_rows, validate_chunk
+
 # Load environment variables
 load_dotenv()
 
@@ -33,15 +39,178 @@ MYSQL_CONFIG = {
 # CSV file path
 CSV_FILE_PATH = os.getenv('CSV_FILE_PATH', 'hr_employee_attrition.csv')
 
+# Rows read from the CSV per chunk when streaming
+CSV_CHUNK_SIZE = int(os.getenv('CSV_CHUNK_SIZE', 10000))
+# Read the typed Parquet snapshot (see hr_snapshot.py) instead of the CSV
+USE_SNAPSHOT = os.getenv('USE_SNAPSHOT', 'false').lower() == 'true'
+
+# Source columns every CSV export must provide
+REQUIRED_COLUMNS = [
+    'EmployeeNumber', 'Age', 'Gender', 'MaritalStatus', 'Education',
+    'EducationField', 'DistanceFromHome', 'Over18', 'EmployeeCount',
+    'Attrition', 'Department', 'JobRole', 'JobLevel', 'JobInvolvement',
+    'JobSatisfaction', 'StandardHours', 'BusinessTravel', 'OverTime',
+    'DailyRate', 'HourlyRate', 'MonthlyIncome', 'MonthlyRate',
+    'PercentSalaryHike', 'StockOptionLevel', 'PerformanceRating',
+    'YearsAtCompany', 'YearsInCurrentRole', 'YearsSinceLastPromotion',
+    'YearsWithCurrManager', 'TotalWorkingYears', 'NumCompaniesWorked',
+    'TrainingTimesLastYear', 'EnvironmentSatisfaction',
+    'RelationshipSatisfaction', 'WorkLifeBalance'
+]
+
+# Import settings
+# 'bulk' writes each table with batched multi-row inserts, 'row' keeps the
+# original one-INSERT-per-table-per-employee loop, 'incremental' upserts only
+# employees whose content hash changed since the last import
+IMPORT_MODE = os.getenv('MYSQL_IMPORT_MODE', 'bulk')
+BATCH_SIZE = int(os.getenv('MYSQL_BATCH_SIZE', 1000))
+# Number of parallel worker connections; 1 keeps the single-connection loader
+WORKERS = int(os.getenv('MYSQL_WORKERS', 1))
+# Delete employees missing from the source during an incremental import
+DELETE_MISSING = os.getenv('SYNC_DELETE_MISSING', 'false').lower() == 'true'
+# Disable unique/foreign key checks and autocommit for the load window
+BULK_LOAD = os.getenv('BULK_LOAD', 'false').lower() == 'true'
+# CSV file receiving the rows MySQL rejected, with the error for each
+REJECT_FILE = os.getenv('MYSQL_REJECT_FILE', 'mysql_rejects.csv')
+# Serializes reject file appends from parallel workers
+REJECT_FILE_LOCK = threading.Lock()
+
+# Column mapping for each normalized table, in foreign-key insert order:
+# (database column, CSV column). 'DepartmentId' is resolved from departments_map.
+TABLE_COLUMNS = {
+    'employees': [
+        ('employee_number', 'EmployeeNumber'),
+        ('age', 'Age'),
+        ('gender', 'Gender'),
+        ('marital_status', 'MaritalStatus'),
+        ('education', 'Education'),
+        ('education_field', 'EducationField'),
+        ('distance_from_home', 'DistanceFromHome'),
+        ('over_18', 'Over18'),
+        ('employee_count', 'EmployeeCount'),
+        ('attrition', 'Attrition')
+    ],
+    'job_details': [
+        ('employee_number', 'EmployeeNumber'),
+        ('department_id', 'DepartmentId'),
+        ('job_role', 'JobRole'),
+        ('job_level', 'JobLevel'),
+        ('job_involvement', 'JobInvolvement'),
+        ('job_satisfaction', 'JobSatisfaction'),
+        ('standard_hours', 'StandardHours'),
+        ('business_travel', 'BusinessTravel'),
+        ('overtime', 'OverTime')
+    ],
+    'compensation': [
+        ('employee_number', 'EmployeeNumber'),
+        ('daily_rate', 'DailyRate'),
+        ('hourly_rate', 'HourlyRate'),
+        ('monthly_income', 'MonthlyIncome'),
+        ('monthly_rate', 'MonthlyRate'),
+        ('percent_salary_hike', 'PercentSalaryHike'),
+        ('stock_option_level', 'StockOptionLevel')
+    ],
+    'performance_metrics': [
+        ('employee_number', 'EmployeeNumber'),
+        ('performance_rating', 'PerformanceRating'),
+        ('years_at_company', 'YearsAtCompany'),
+        ('years_in_current_role', 'YearsInCurrentRole'),
+        ('years_since_last_promotion', 'YearsSinceLastPromotion'),
+        ('years_with_curr_manager', 'YearsWithCurrManager'),
+        ('total_working_years', 'TotalWorkingYears'),
+        ('num_companies_worked', 'NumCompaniesWorked'),
+        ('training_times_last_year', 'TrainingTimesLastYear')
+    ],
+    'satisfaction_scores': [
+        ('employee_number', 'EmployeeNumber'),
+        ('environment_satisfaction', 'EnvironmentSatisfaction'),
+        ('job_satisfaction', 'JobSatisfaction'),
+        ('relationship_satisfaction', 'RelationshipSatisfaction'),
+        ('work_life_balance', 'WorkLifeBalance')
+    ]
+}
+
+# CSV columns stored as text; every other mapped column is an INT
+STRING_COLUMNS = {
+    'Gender', 'MaritalStatus', 'EducationField', 'Over18', 'Attrition',
+    'JobRole', 'BusinessTravel', 'OverTime'
+}
+
+
+def compute_content_hashes(df: pd.DataFrame) -> pd.Series:
+    """Hash the source columns of each row to detect new or changed employees"""
+    # Normalize dtypes first so a column read as float in one chunk and int in
+    # another still hashes the same
+    normalized = pd.DataFrame({
+        col: df[col].astype('int64') if pd.api.types.is_numeric_dtype(df[col]) else df[col].astype(str)
+        for col in REQUIRED_COLUMNS
+    })
+    hashes = pd.util.hash_pandas_object(normalized, index=False)
+    return hashes.map('{:016x}'.format)
+
+
+class ImportProgress:
+    """Thread-safe progress counter shared by parallel import workers"""
+    
+    def __init__(self):
+        self.success_count = 0
+        self.error_count = 0
+        self.start_time = time.perf_counter()
+        self._lock = threading.Lock()
+    
+    def update(self, success: int = 0, errors: int = 0):
+        """Record a finished batch and log the combined progress"""
+        with self._lock:
+            self.success_count += success
+            self.error_count += errors
+            logger.info(f"Inserted {self.success_count} records...")
+    
+    def report(self):
+        """Log the combined totals and load rate"""
+        elapsed = time.perf_counter() - self.start_time
+        rate = self.success_count / elapsed if elapsed > 0 else 0
+        logger.info(
+            f"Successfully inserted {self.success_count} records into MySQL "
+            f"in {elapsed:.2f}s ({rate:.0f} rows/sec)"
+        )
+        if self.error_count > 0:
+            logger.warning(f"Failed to insert {self.error_count} records (see {REJECT_FILE})")
+
 
 class MySQLDataImporter:
     """Class to handle data import for HR Attrition dataset into MySQL"""
     
-    def __init__(self):
+    def __init__(self, mode: str = IMPORT_MODE, batch_size: int = BATCH_SIZE,
+                 workers: int = WORKERS, bulk_load: bool = BULK_LOAD):
         """Initialize MySQL connection"""
         self.connection = None
         self.cursor = None
         self.departments_map = {}
+        self.mode = mode
+        self.batch_size = batch_size
+        self.workers = workers
+        self.bulk_load = bulk_load
+        # ON DUPLICATE KEY UPDATE relies on the unique check to find the existing row
+        if self.bulk_load and self.mode == 'incremental':
+            logger.warning("BULK_LOAD is ignored in incremental mode: upserts need unique_checks")
+            self.bulk_load = False
+        self.saved_autocommit = None
+        self.load_start = None
+        self.worker_importers = []
+        self.progress = None
+        self.seen_employees = set()
+        self.sync_counts = {'new': 0, 'changed': 0, 'unchanged': 0, 'failed': 0}
+        # Checkpoints are keyed by the CSV path; the snapshot holds the same rows in the same order
+        self.checkpoint_source = os.path.abspath(CSV_FILE_PATH)
+        self.checkpointing = False
+        self.batch_id = 0
+        self.resume_offset = 0
+        self.rows_done = 0
+        self.total_rows = None
+        self.pending_checkpoint = None
+        self.reject_file = REJECT_FILE
+        self.validated_employees = set()
+        self.quarantine_file = QUARANTINE_FILE
         
     def connect_mysql(self):
         """Establish MySQL connection"""
@@ -72,6 +241,15 @@ class MySQLDataImporter:
                 self.cursor.execute(f"TRUNCATE TABLE {table}")
                 logger.info(f"Cleared table: {table}")
             
+            # The department summary is rebuilt at the end of the next import
+            self.create_department_stats_table()
+            self.cursor.execute("TRUNCATE TABLE department_stats")
+            logger.info("Cleared table: department_stats")
+            
+            # The incremental import manifest and the checkpoints are recreated on demand
+            self.cursor.execute("DROP TABLE IF EXISTS import_manifest")
+            self.cursor.execute("DROP TABLE IF EXISTS import_checkpoint")
+            
             # Re-enable foreign key checks
             self.cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
             self.connection.commit()
@@ -81,6 +259,86 @@ class MySQLDataImporter:
             logger.error(f"Error clearing MySQL tables: {e}")
             raise
     
+    def begin_bulk_load(self):
+        """Turn off unique/foreign key checks and autocommit for this session"""
+        self.saved_autocommit = self.connection.autocommit
+        self.connection.autocommit = False
+        self.cursor.execute("SET unique_checks = 0")
+        self.cursor.execute("SET foreign_key_checks = 0")
+    
+    def end_bulk_load(self):
+        """Restore the checks and autocommit setting changed by begin_bulk_load"""
+        for worker in self.worker_importers:
+            worker.end_bulk_load()
+        self.connection.commit()
+        self.cursor.execute("SET unique_checks = 1")
+        self.cursor.execute("SET foreign_key_checks = 1")
+        self.connection.autocommit = self.saved_autocommit
+    
+    def validate_bulk_load(self) -> bool:
+        """Check the referential integrity that was not enforced during a bulk load"""
+        try:
+            checks = {
+                'job_details rows without an employee': """
+                    SELECT COUNT(*) FROM job_details j
+                    LEFT JOIN employees e ON j.employee_number = e.employee_number
+                    WHERE e.employee_number IS NULL
+                """,
+                'job_details rows without a department': """
+                    SELECT COUNT(*) FROM job_details j
+                    LEFT JOIN departments d ON j.department_id = d.department_id
+                    WHERE d.department_id IS NULL
+                """
+            }
+            for table in ['compensation', 'performance_metrics', 'satisfaction_scores']:
+                checks[f"{table} rows without an employee"] = f"""
+                    SELECT COUNT(*) FROM {table} t
+                    LEFT JOIN employees e ON t.employee_number = e.employee_number
+                    WHERE e.employee_number IS NULL
+                """
+                checks[f"duplicate employees in {table}"] = f"""
+                    SELECT COUNT(*) - COUNT(DISTINCT employee_number) FROM {table}
+                """
+            
+            valid = True
+            for description, query in checks.items():
+                self.cursor.execute(query)
+                count = self.cursor.fetchone()[0]
+                if count:
+                    valid = False
+                    logger.warning(f"Bulk load validation: {count} {description}")
+            
+            if valid:
+                logger.info("Bulk load validation passed")
+            return valid
+            
+        except Error as e:
+            logger.error(f"Error validating bulk load: {e}")
+            raise
+    
+    def prepare_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fill missing values and validate required columns"""
+        # Handle any NaN values
+        df = df.fillna({
+            'NumCompaniesWorked': 0,
+            'YearsInCurrentRole': 0,
+            'YearsSinceLastPromotion': 0,
+            'YearsWithCurrManager': 0,
+            'TrainingTimesLastYear': 0
+        })
+        
+        # Validate required columns
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+        
+        # Quarantine rows that fail the type, range, allowed value or duplicate checks
+        df, rejects = validate_chunk(df, self.validated_employees)
+        if len(rejects):
+            quarantine_rows(rejects, self.quarantine_file)
+        
+        return df
+    
     def load_csv_data(self) -> pd.DataFrame:
         """Load and preprocess CSV data"""
         try:
@@ -91,34 +349,38 @@ class MySQLDataImporter:
             df = pd.read_csv(CSV_FILE_PATH)
             logger.info(f"Loaded {len(df)} records from {CSV_FILE_PATH}")
             
-            # Handle any NaN values
-            df = df.fillna({
-                'NumCompaniesWorked': 0,
-                'YearsInCurrentRole': 0,
-                'YearsSinceLastPromotion': 0,
-                'YearsWithCurrManager': 0,
-                'TrainingTimesLastYear': 0
-            })
-            
-            # Validate required columns
-            required_columns = [
-                'EmployeeNumber', 'Age', 'Gender', 'MaritalStatus', 'Education',
-                'EducationField', 'DistanceFromHome', 'Over18', 'EmployeeCount',
-                'Attrition', 'Department', 'JobRole', 'JobLevel', 'JobInvolvement',
-                'JobSatisfaction', 'StandardHours', 'BusinessTravel', 'OverTime',
-                'DailyRate', 'HourlyRate', 'MonthlyIncome', 'MonthlyRate',
-                'PercentSalaryHike', 'StockOptionLevel', 'PerformanceRating',
-                'YearsAtCompany', 'YearsInCurrentRole', 'YearsSinceLastPromotion',
-                'YearsWithCurrManager', 'TotalWorkingYears', 'NumCompaniesWorked',
-                'TrainingTimesLastYear', 'EnvironmentSatisfaction', 
-                'RelationshipSatisfaction', 'WorkLifeBalance'
-            ]
+            return self.prepare_data(df)
             
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                raise ValueError(f"Missing required columns: {missing_columns}")
+        except Exception as e:
+            logger.error(f"Error loading CSV file: {e}")
+            raise
+    
+    def iter_csv_chunks(self, chunk_size: int = CSV_CHUNK_SIZE, start_row: int = 0):
+        """Stream the CSV in fixed-size, preprocessed chunks, starting at start_row"""
+        try:
+            if USE_SNAPSHOT:
+                # Typed Parquet snapshot built by hr_snapshot.py; skips CSV text parsing
+                from hr_snapshot import SNAPSHOT_PATH, iter_snapshot_chunks
+                source = SNAPSHOT_PATH
+                reader = iter_snapshot_chunks(chunk_size, start_row=start_row)
+            else:
+                # Check if file exists
+                if not os.path.exists(CSV_FILE_PATH):
+                    raise FileNotFoundError(f"CSV file not found: {CSV_FILE_PATH}")
+                source = CSV_FILE_PATH
+                # Line 0 is the header; data row n is on line n + 1
+                skiprows = (lambda line: 0 < line <= start_row) if start_row else None
+                reader = pd.read_csv(CSV_FILE_PATH, chunksize=chunk_size, skiprows=skiprows)
             
-            return df
+            loaded_count = 0
+            for chunk in reader:
+                # Index rows by their position in the source so checkpoints can refer to them
+                chunk.index = pd.RangeIndex(start_row + loaded_count, start_row + loaded_count + len(chunk))
+                loaded_count += len(chunk)
+                logger.info(f"Loaded {start_row + loaded_count} records from {source}...")
+                chunk = self.prepare_data(chunk)
+                if len(chunk):
+                    yield chunk
             
         except Exception as e:
             logger.error(f"Error loading CSV file: {e}")
@@ -127,7 +389,13 @@ class MySQLDataImporter:
     def insert_departments(self, df: pd.DataFrame):
         """Insert unique departments into MySQL"""
         try:
-            departments = df['Department'].unique()
+            # Skip departments already resolved by an earlier chunk
+            departments = [
+                dept_name for dept_name in df['Department'].unique()
+                if dept_name not in self.departments_map
+            ]
+            if not departments:
+                return
             
             for dept_name in departments:
                 # Insert department
@@ -166,6 +434,10 @@ class MySQLDataImporter:
             
             for idx, row in df.iterrows():
                 try:
+                    # A failing employee only undoes its own statements, not the
+                    # uncommitted employees before it
+                    self.cursor.execute("SAVEPOINT employee_row")
+                    
                     # 1. Insert into employees table
                     employee_query = """
                         INSERT INTO employees (
@@ -270,26 +542,427 @@ class MySQLDataImporter:
                     
                     # Commit every 100 records for better performance
                     if success_count % 100 == 0:
-                        self.connection.commit()
+                        if self.checkpointing:
+                            self.write_checkpoint(idx + 1, int(row['EmployeeNumber']))
+                        self.commit_batch()
                         logger.info(f"Inserted {success_count} records...")
                         
                 except Error as e:
                     error_count += 1
                     logger.warning(f"Error inserting row {idx} (Employee {row['EmployeeNumber']}): {e}")
-                    self.connection.rollback()
+                    self.cursor.execute("ROLLBACK TO SAVEPOINT employee_row")
+                    self.reject_rows(df.loc[[idx]], str(e))
                     continue
             
-            # Final commit
-            self.connection.commit()
+            # Final commit; the checkpoint for the last partial block commits with it
+            if self.checkpointing and len(df) > 0:
+                self.write_checkpoint(int(df.index[-1]) + 1, int(df['EmployeeNumber'].iloc[-1]))
+            self.commit_batch()
             logger.info(f"Successfully inserted {success_count} records into MySQL")
             if error_count > 0:
-                logger.warning(f"Failed to insert {error_count} records")
+                logger.warning(f"Failed to insert {error_count} records (see {self.reject_file})")
             
         except Error as e:
             self.connection.rollback()
             logger.error(f"Error inserting data into MySQL: {e}")
             raise
     
+    def reject_rows(self, rows: pd.DataFrame, error: str):
+        """Append rows MySQL refused to the reject file, with the error"""
+        rejects = rows.assign(error=error)
+        with REJECT_FILE_LOCK:
+            header = not os.path.exists(self.reject_file) or os.path.getsize(self.reject_file) == 0
+            rejects.to_csv(self.reject_file, mode='a', header=header, index_label='source_row')
+        logger.warning(f"Rejected employee {rows['EmployeeNumber'].iloc[0]}: {error}")
+    
+    def commit_batch(self):
+        """Commit the current transaction and advance the checkpoint written in it"""
+        self.connection.commit()
+        if self.pending_checkpoint:
+            self.rows_done, self.batch_id = self.pending_checkpoint
+            self.pending_checkpoint = None
+    
+    def commit_with_bisection(self, write_batch, df: pd.DataFrame, start: int, end: int) -> list:
+        """Commit rows start..end-1 with write_batch, bisecting a failed batch to isolate bad rows
+        
+        Returns the positions of the rejected rows.
+        """
+        try:
+            write_batch(start, end)
+            self.commit_batch()
+            return []
+        except Error as e:
+            self.connection.rollback()
+            self.pending_checkpoint = None
+            if end - start == 1:
+                self.reject_rows(df.iloc[start:end], str(e))
+                return [start]
+        
+        # Retry both halves; clean halves still commit as multi-row batches
+        mid = (start + end) // 2
+        return (self.commit_with_bisection(write_batch, df, start, mid) +
+                self.commit_with_bisection(write_batch, df, mid, end))
+    
+    def build_table_params(self, df: pd.DataFrame) -> dict:
+        """Build the INSERT parameter rows for every table from DataFrame columns"""
+        df = df.assign(DepartmentId=df['Department'].map(self.departments_map))
+        
+        params = {}
+        for table, columns in TABLE_COLUMNS.items():
+            # Convert each column once instead of calling int() per row and field;
+            # tolist() yields native Python types that mysql.connector accepts
+            values = []
+            for _, csv_col in columns:
+                if csv_col in STRING_COLUMNS:
+                    values.append(df[csv_col].astype(str).tolist())
+                else:
+                    values.append(df[csv_col].astype('int64').tolist())
+            params[table] = list(zip(*values))
+        
+        return params
+    
+    def build_insert_query(self, table: str, upsert: bool = False) -> str:
+        """Build the parameterized INSERT statement for a table"""
+        db_columns = [db_col for db_col, _ in TABLE_COLUMNS[table]]
+        query = (
+            f"INSERT INTO {table} ({', '.join(db_columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(db_columns))})"
+        )
+        # job_details has no unique key per employee, so it is never upserted
+        if upsert and table != 'job_details':
+            updates = [f"{col}=VALUES({col})" for col in db_columns if col != 'employee_number']
+            query += f" ON DUPLICATE KEY UPDATE {', '.join(updates)}"
+        elif table == 'employees':
+            query += " ON DUPLICATE KEY UPDATE employee_number=employee_number"
+        return query
+    
+    def insert_data_bulk(self, df: pd.DataFrame, progress: ImportProgress = None):
+        """Insert data into MySQL tables with batched multi-row inserts"""
+        start_time = time.perf_counter()
+        success_count = 0
+        error_count = 0
+        
+        params = self.build_table_params(df)
+        queries = {table: self.build_insert_query(table) for table in TABLE_COLUMNS}
+        total = len(df)
+        
+        def write_batch(start, end):
+            # executemany rewrites each INSERT into a single multi-VALUES statement
+            for table, query in queries.items():
+                self.cursor.executemany(query, params[table][start:end])
+            # The checkpoint commits in the same transaction as the batch it covers
+            if self.checkpointing:
+                self.write_checkpoint(int(df.index[end - 1]) + 1, params['employees'][end - 1][0])
+        
+        for start in range(0, total, self.batch_size):
+            end = min(start + self.batch_size, total)
+            rejected = len(self.commit_with_bisection(write_batch, df, start, end))
+            success_count += end - start - rejected
+            error_count += rejected
+            if progress:
+                progress.update(success=end - start - rejected, errors=rejected)
+            elif self.checkpointing:
+                self.log_checkpoint_progress()
+            else:
+                logger.info(f"Inserted {success_count} records...")
+        
+        # Parallel workers leave the summary to the shared progress counter
+        if progress:
+            return success_count, error_count
+        
+        elapsed = time.perf_counter() - start_time
+        rate = success_count / elapsed if elapsed > 0 else 0
+        logger.info(
+            f"Successfully inserted {success_count} records into MySQL "
+            f"in {elapsed:.2f}s ({rate:.0f} rows/sec, batch size {self.batch_size})"
+        )
+        if error_count > 0:
+            logger.warning(f"Failed to insert {error_count} records (see {self.reject_file})")
+        
+        return success_count, error_count
+    
+    def create_manifest_table(self):
+        """Create the table holding one content hash per imported employee"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS import_manifest (
+                employee_number INT PRIMARY KEY,
+                content_hash CHAR(16) NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            )
+        """)
+        self.connection.commit()
+    
+    def create_department_stats_table(self):
+        """Create the per-department summary maintained by the API writes"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS department_stats (
+                department_id INT PRIMARY KEY,
+                employee_count INT NOT NULL DEFAULT 0,
+                attrition_count INT NOT NULL DEFAULT 0,
+                job_satisfaction_sum INT NOT NULL DEFAULT 0,
+                job_satisfaction_count INT NOT NULL DEFAULT 0,
+                environment_satisfaction_sum INT NOT NULL DEFAULT 0,
+                relationship_satisfaction_sum INT NOT NULL DEFAULT 0,
+                work_life_balance_sum INT NOT NULL DEFAULT 0,
+                satisfaction_count INT NOT NULL DEFAULT 0,
+                monthly_income_sum BIGINT NOT NULL DEFAULT 0,
+                income_count INT NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                FOREIGN KEY (department_id) REFERENCES departments(department_id) ON DELETE CASCADE
+            )
+        """)
+        self.connection.commit()
+    
+    def rebuild_department_stats(self):
+        """Recompute department_stats from scratch with one GROUP BY over the employees"""
+        try:
+            self.create_department_stats_table()
+            start_time = time.perf_counter()
+            self.cursor.execute("DELETE FROM department_stats")
+            self.cursor.execute("""
+                INSERT INTO department_stats (
+                    department_id, employee_count, attrition_count,
+                    job_satisfaction_sum, job_satisfaction_count,
+                    environment_satisfaction_sum, relationship_satisfaction_sum,
+                    work_life_balance_sum, satisfaction_count,
+                    monthly_income_sum, income_count
+                )
+                SELECT j.department_id, COUNT(*),
+                       SUM(CASE WHEN e.attrition = 'Yes' THEN 1 ELSE 0 END),
+                       COALESCE(SUM(j.job_satisfaction), 0), COUNT(j.job_satisfaction),
+                       COALESCE(SUM(s.environment_satisfaction), 0),
+                       COALESCE(SUM(s.relationship_satisfaction), 0),
+                       COALESCE(SUM(s.work_life_balance), 0), COUNT(s.satisfaction_id),
+                       COALESCE(SUM(c.monthly_income), 0), COUNT(c.compensation_id)
+                FROM job_details j
+                JOIN employees e ON j.employee_number = e.employee_number
+                LEFT JOIN satisfaction_scores s ON s.employee_number = j.employee_number
+                LEFT JOIN compensation c ON c.employee_number = j.employee_number
+                WHERE j.department_id IS NOT NULL
+                GROUP BY j.department_id
+            """)
+            departments = self.cursor.rowcount
+            self.connection.commit()
+            logger.info(
+                f"Rebuilt department_stats for {departments} departments "
+                f"in {time.perf_counter() - start_time:.2f}s"
+            )
+        except Error as e:
+            self.connection.rollback()
+            logger.error(f"Error rebuilding department_stats: {e}")
+            raise
+    
+    def fetch_manifest_hashes(self, employee_numbers: list) -> dict:
+        """Fetch the stored content hash for each of the given employees"""
+        hashes = {}
+        for start in range(0, len(employee_numbers), self.batch_size):
+            batch = employee_numbers[start:start + self.batch_size]
+            self.cursor.execute(
+                "SELECT employee_number, content_hash FROM import_manifest "
+                f"WHERE employee_number IN ({', '.join(['%s'] * len(batch))})",
+                batch
+            )
+            hashes.update(self.cursor.fetchall())
+        return hashes
+    
+    def insert_data_incremental(self, df: pd.DataFrame):
+        """Upsert only new or changed employees, tracked by content hash"""
+        hashes = compute_content_hashes(df).tolist()
+        employee_numbers = df['EmployeeNumber'].astype('int64').tolist()
+        self.seen_employees.update(employee_numbers)
+        
+        stored = self.fetch_manifest_hashes(employee_numbers)
+        changed_mask = [stored.get(n) != h for n, h in zip(employee_numbers, hashes)]
+        changed = df[changed_mask]
+        changed_hashes = [h for h, is_changed in zip(hashes, changed_mask) if is_changed]
+        self.sync_counts['unchanged'] += len(df) - len(changed)
+        
+        params = self.build_table_params(changed)
+        queries = {table: self.build_insert_query(table, upsert=True) for table in TABLE_COLUMNS}
+        manifest_query = """
+            INSERT INTO import_manifest (employee_number, content_hash) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE content_hash=VALUES(content_hash)
+        """
+        manifest_params = list(zip([row[0] for row in params['employees']], changed_hashes))
+        
+        def write_batch(start, end):
+            batch_numbers = [row[0] for row in params['employees'][start:end]]
+            # Replace the job_details rows instead of upserting them. Every employee of
+            # the batch is cleared, not just those in the manifest: a database loaded in
+            # bulk or row mode already holds job_details rows but has an empty manifest
+            self.cursor.execute(
+                "DELETE FROM job_details "
+                f"WHERE employee_number IN ({', '.join(['%s'] * len(batch_numbers))})",
+                batch_numbers
+            )
+            for table, query in queries.items():
+                self.cursor.executemany(query, params[table][start:end])
+            self.cursor.executemany(manifest_query, manifest_params[start:end])
+            if self.checkpointing:
+                self.write_checkpoint(int(changed.index[end - 1]) + 1, batch_numbers[-1])
+        
+        for start in range(0, len(changed), self.batch_size):
+            end = min(start + self.batch_size, len(changed))
+            rejected = set(self.commit_with_bisection(write_batch, changed, start, end))
+            committed = [
+                params['employees'][position][0]
+                for position in range(start, end) if position not in rejected
+            ]
+            existing = sum(1 for n in committed if n in stored)
+            self.sync_counts['changed'] += existing
+            self.sync_counts['new'] += len(committed) - existing
+            self.sync_counts['failed'] += len(rejected)
+        
+        logger.info(
+            f"Synced chunk: {len(changed)} new or changed, "
+            f"{len(df) - len(changed)} unchanged employees"
+        )
+    
+    def delete_missing_employees(self):
+        """Delete employees that are no longer present in the source"""
+        try:
+            self.cursor.execute("SELECT employee_number FROM import_manifest")
+            missing = [n for (n,) in self.cursor.fetchall() if n not in self.seen_employees]
+            
+            for start in range(0, len(missing), self.batch_size):
+                batch = missing[start:start + self.batch_size]
+                placeholders = ', '.join(['%s'] * len(batch))
+                # Child tables are removed by ON DELETE CASCADE
+                self.cursor.execute(f"DELETE FROM employees WHERE employee_number IN ({placeholders})", batch)
+                self.cursor.execute(f"DELETE FROM import_manifest WHERE employee_number IN ({placeholders})", batch)
+                self.connection.commit()
+            
+            logger.info(f"Deleted {len(missing)} employees missing from the source")
+            
+        except Error as e:
+            self.connection.rollback()
+            logger.error(f"Error deleting missing employees: {e}")
+            raise
+    
+    def create_checkpoint_table(self):
+        """Create the table holding the last committed position of each import source"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS import_checkpoint (
+                source VARCHAR(500) PRIMARY KEY,
+                rows_done BIGINT NOT NULL,
+                last_employee_number INT,
+                batch_id INT NOT NULL,
+                total_rows BIGINT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            )
+        """)
+        self.connection.commit()
+    
+    def fetch_checkpoint(self) -> dict:
+        """Fetch the stored checkpoint of the import source, if there is one"""
+        self.cursor.execute(
+            "SELECT rows_done, last_employee_number, batch_id FROM import_checkpoint WHERE source = %s",
+            (self.checkpoint_source,)
+        )
+        row = self.cursor.fetchone()
+        if not row:
+            return None
+        return {'rows_done': row[0], 'last_employee_number': row[1], 'batch_id': row[2]}
+    
+    def reset_checkpoint(self):
+        """Forget the checkpoint of the import source before a fresh import"""
+        try:
+            self.cursor.execute("DELETE FROM import_checkpoint WHERE source = %s", (self.checkpoint_source,))
+            self.connection.commit()
+        except Error as e:
+            self.connection.rollback()
+            logger.error(f"Error resetting import checkpoint: {e}")
+            raise
+    
+    def write_checkpoint(self, rows_done: int, last_employee_number: int):
+        """Record the source position reached; committed by the caller with its batch"""
+        self.pending_checkpoint = (rows_done, self.batch_id + 1)
+        self.cursor.execute("""
+            INSERT INTO import_checkpoint (source, rows_done, last_employee_number, batch_id, total_rows)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE rows_done=VALUES(rows_done),
+                last_employee_number=VALUES(last_employee_number),
+                batch_id=VALUES(batch_id), total_rows=VALUES(total_rows)
+        """, (self.checkpoint_source, rows_done, last_employee_number, self.batch_id + 1, self.total_rows))
+    
+    def save_checkpoint(self, df: pd.DataFrame):
+        """Commit a checkpoint at the end of a fully processed chunk"""
+        rows_done = int(df.index[-1]) + 1
+        if rows_done == self.rows_done:
+            return
+        
+        try:
+            self.write_checkpoint(rows_done, int(df['EmployeeNumber'].iloc[-1]))
+            self.commit_batch()
+            self.log_checkpoint_progress()
+        except Error as e:
+            self.connection.rollback()
+            self.pending_checkpoint = None
+            logger.error(f"Error saving import checkpoint: {e}")
+            raise
+    
+    def log_checkpoint_progress(self):
+        """Log progress, load rate and ETA from the last checkpoint"""
+        loaded = self.rows_done - self.resume_offset
+        elapsed = time.perf_counter() - self.load_start
+        rate = loaded / elapsed if elapsed > 0 else 0
+        if self.total_rows and rate > 0:
+            remaining = max(self.total_rows - self.rows_done, 0)
+            logger.info(
+                f"Checkpoint batch {self.batch_id}: {self.rows_done}/{self.total_rows} rows "
+                f"({self.rows_done / self.total_rows:.1%}), {rate:.0f} rows/sec, "
+                f"ETA {remaining / rate:.0f}s"
+            )
+        else:
+            logger.info(f"Checkpoint batch {self.batch_id}: {self.rows_done} rows")
+    
+    def count_source_rows(self) -> int:
+        """Count the data rows in the import source for progress and ETA reporting"""
+        if USE_SNAPSHOT:
+            from hr_snapshot import SNAPSHOT_PATH, snapshot_row_count
+            return snapshot_row_count(SNAPSHOT_PATH)
+        
+        with open(CSV_FILE_PATH, 'rb') as f:
+            return sum(1 for _ in f) - 1
+    
+    def start_workers(self):
+        """Open one MySQL connection per parallel worker"""
+        for _ in range(self.workers):
+            worker = MySQLDataImporter(mode='bulk', batch_size=self.batch_size, workers=1)
+            worker.connect_mysql()
+            if self.bulk_load:
+                worker.begin_bulk_load()
+            # Departments are resolved once by the main connection and shared
+            worker.departments_map = self.departments_map
+            self.worker_importers.append(worker)
+        self.progress = ImportProgress()
+        logger.info(f"Started {self.workers} MySQL import workers")
+    
+    def insert_data_parallel(self, df: pd.DataFrame):
+        """Insert data into MySQL tables from a pool of worker connections"""
+        if not self.worker_importers:
+            self.start_workers()
+        
+        # Split the chunk into contiguous EmployeeNumber ranges, one per worker
+        df = df.sort_values('EmployeeNumber')
+        range_size = -(-len(df) // len(self.worker_importers))
+        ranges = [df.iloc[start:start + range_size] for start in range(0, len(df), range_size)]
+        
+        def load_range(worker, part):
+            logger.info(
+                f"Loading employees {part['EmployeeNumber'].iloc[0]}-"
+                f"{part['EmployeeNumber'].iloc[-1]}"
+            )
+            return worker.insert_data_bulk(part, progress=self.progress)
+        
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(load_range, worker, part)
+                for worker, part in zip(self.worker_importers, ranges)
+            ]
+            for future in futures:
+                future.result()
+    
     def verify_data(self):
         """Verify data insertion in MySQL"""
         try:
@@ -353,35 +1026,135 @@ class MySQLDataImporter:
     
     def close_connection(self):
         """Close MySQL connection"""
+        for worker in self.worker_importers:
+            worker.close_connection()
+        self.worker_importers = []
         if self.cursor:
             self.cursor.close()
         if self.connection:
             self.connection.close()
             logger.info("MySQL connection closed")
     
-    def run_import(self):
+    def start_import(self, resume: bool = False):
+        """Prepare the database session before the first chunk is loaded"""
+        if self.mode == 'incremental':
+            self.create_manifest_table()
+        
+        # Parallel workers commit their ranges out of order, so only a single
+        # connection keeps a contiguous checkpoint
+        if self.workers > 1:
+            if resume:
+                raise ValueError("Resuming requires a single import connection (MYSQL_WORKERS=1)")
+        else:
+            self.create_checkpoint_table()
+            self.checkpointing = True
+            self.total_rows = self.count_source_rows()
+            checkpoint = self.fetch_checkpoint() if resume else None
+            if checkpoint:
+                self.resume_offset = self.rows_done = checkpoint['rows_done']
+                self.batch_id = checkpoint['batch_id']
+                logger.info(
+                    f"Resuming after row {self.resume_offset} (employee "
+                    f"{checkpoint['last_employee_number']}, batch {self.batch_id}): "
+                    f"{max(self.total_rows - self.resume_offset, 0)} of {self.total_rows} rows remaining"
+                )
+            else:
+                if resume:
+                    logger.info("No checkpoint found, starting from the first row")
+                self.reset_checkpoint()
+        
+        # A fresh import starts new reject and quarantine files; a resumed one appends to them
+        if not self.resume_offset:
+            for path in [self.reject_file, self.quarantine_file]:
+                if os.path.exists(path):
+                    os.remove(path)
+        
+        if self.bulk_load:
+            logger.info("Disabling unique/foreign key checks for bulk load...")
+            self.begin_bulk_load()
+        
+        self.load_start = time.perf_counter()
+    
+    def load_chunk(self, chunk: pd.DataFrame):
+        """Load one preprocessed CSV chunk into the MySQL tables"""
+        # Insert departments first
+        self.insert_departments(chunk)
+        
+        # Insert data into MySQL
+        if self.mode == 'incremental':
+            logger.info("Syncing changed employees into MySQL tables (incremental mode)...")
+            self.insert_data_incremental(chunk)
+        elif self.workers > 1:
+            logger.info(f"Inserting data into MySQL tables ({self.workers} workers)...")
+            self.insert_data_parallel(chunk)
+        elif self.mode == 'bulk':
+            logger.info("Inserting data into MySQL tables (bulk mode)...")
+            self.insert_data_bulk(chunk)
+        else:
+            logger.info("Inserting data into MySQL tables (row mode)...")
+            self.insert_data(chunk)
+        
+        # Cover rows that were skipped or rejected after the last batch commit
+        if self.checkpointing and len(chunk):
+            self.save_checkpoint(chunk)
+    
+    def finish_import(self):
+        """Report, sync deletions and restore bulk-load settings after the last chunk"""
+        if self.progress:
+            self.progress.report()
+        
+        if self.mode == 'incremental':
+            logger.info(
+                "Incremental import: {new} new, {changed} changed, "
+                "{unchanged} unchanged, {failed} failed".format(**self.sync_counts)
+            )
+            if DELETE_MISSING and self.resume_offset:
+                # Employees before the checkpoint were not seen in this run
+                logger.warning("Skipping deletion of missing employees on a resumed import")
+            elif DELETE_MISSING:
+                self.delete_missing_employees()
+        
+        if self.bulk_load:
+            insert_time = time.perf_counter() - self.load_start
+            
+            # Restore the checks, then validate what they would have enforced
+            logger.info("Restoring unique/foreign key checks...")
+            validation_start = time.perf_counter()
+            self.end_bulk_load()
+            self.validate_bulk_load()
+            validation_time = time.perf_counter() - validation_start
+            logger.info(
+                f"Bulk load timings: inserts {insert_time:.2f}s, "
+                f"check restore and validation {validation_time:.2f}s"
+            )
+        
+        # The import writes the tables directly, so the summary is recomputed once at the end
+        self.rebuild_department_stats()
+    
+    def run_import(self, resume: bool = False):
         """Main method to run the complete import process"""
         try:
             # Connect to MySQL
             self.connect_mysql()
             
-            # Ask user if they want to clean existing data
-            response = input("\nDo you want to clean existing data before import? (y/n): ").lower()
-            if response == 'y':
-                logger.info("Cleaning existing data...")
-                self.clean_tables()
+            # A resumed import keeps the data committed before the checkpoint
+            if resume:
+                logger.info("Resuming from the last import checkpoint...")
+            else:
+                # Ask user if they want to clean existing data
+                response = input("\nDo you want to clean existing data before import? (y/n): ").lower()
+                if response == 'y':
+                    logger.info("Cleaning existing data...")
+                    self.clean_tables()
             
-            # Load CSV data
-            logger.info("Loading CSV data...")
-            df = self.load_csv_data()
+            self.start_import(resume=resume)
             
-            # Insert departments first
-            logger.info("Inserting departments...")
-            self.insert_departments(df)
+            # Stream CSV data chunk by chunk so memory stays flat
+            logger.info("Streaming CSV data...")
+            for chunk in self.iter_csv_chunks(start_row=self.resume_offset):
+                self.load_chunk(chunk)
             
-            # Insert data into MySQL
-            logger.info("Inserting data into MySQL tables...")
-            self.insert_data(df)
+            self.finish_import()
             
             # Verify insertion
             logger.info("Verifying data insertion...")
@@ -396,9 +1169,24 @@ class MySQLDataImporter:
         finally:
             self.close_connection()
 
-
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Import the HR Attrition CSV into MySQL")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue an interrupted import from its last committed batch")
+    parser.add_argument('--rebuild-stats', action='store_true',
+                        help="Only recompute the department_stats summary from the current data")
+    args = parser.parse_args()
+    
+    if args.rebuild_stats:
+        importer = MySQLDataImporter()
+        try:
+            importer.connect_mysql()
+            importer.rebuild_department_stats()
+        finally:
+            importer.close_connection()
+        return
+    
     print("=" * 60)
     print("MYSQL DATA IMPORT SCRIPT FOR HR EMPLOYEE ATTRITION")
     print("=" * 60)
@@ -418,9 +1206,10 @@ def main():
     
     try:
         # Run import
-        importer.run_import()
+        importer.run_import(resume=args.resume)
     except KeyboardInterrupt:
         print("\n\n⚠️  Import interrupted by user")
+        print("Run with --resume to continue from the last checkpoint")
     except Exception as e:
         print(f"\n❌ Import failed with error: {e}")
         return
@@ -1,21 +1,45 @@
 from fastapi import FastAPI
-from .mysql_routers import employees_router, departments_router, job_details_router 
+from .mysql_routers import employees_router, departments_router, job_details_router, risk_router
 from .mongo_routers import mongo_departments_router, mongo_employees_router, mongo_job_details_router, mongo_predictions_router
-# from mongo_database import mongo_db
+from .mongo_database import async_mongo_db
+from .reference_cache import department_cache
+from .response_cache import ResponseCacheMiddleware, response_cache
 
 app = FastAPI(
     title="Employee Attrition API",
     description="CRUD operations for employees, departments, job details, and predictions",
 )
 
+app.add_middleware(ResponseCacheMiddleware)
+
 app.include_router(employees_router.router)
 app.include_router(departments_router.router)
 app.include_router(job_details_router.router)
+app.include_router(risk_router.router)
 app.include_router(mongo_departments_router.router)
 app.include_router(mongo_employees_router.router)
 app.include_router(mongo_job_details_router.router)
 app.include_router(mongo_predictions_router.router)
 
 
+@app.on_event("startup")
+async def create_pagination_indexes():
+    """Create the predictions indexes used by keyset pagination (no-op when they exist)"""
+    try:
+        predictions = async_mongo_db["predictions"]
+        await predictions.create_index([("prediction_date", -1), ("_id", -1)])
+        await predictions.create_index([("employee_number", 1), ("prediction_date", -1), ("_id", -1)])
+    except Exception as e:
+        print(f"⚠️ Could not create predictions indexes: {e}")
+
+
+@app.get("/cache/departments", tags=["Cache"])
+def department_cache_stats():
+    """Hit/miss counters and size of the department reference cache"""
+    return department_cache.stats()
 
 
+@app.get("/cache/responses", tags=["Cache"])
+def response_cache_stats():
+    """Size and hit/miss/304 counters of the HTTP response cache"""
+    return response_cache.stats()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey, DateTime, Date, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -18,6 +18,16 @@ class Employee(Base):
     employee_count = Column(Integer, nullable=False, default=1)
     attrition = Column(String(3), nullable=False)
     created_at = Column(DateTime, nullable=True, server_default=func.now())
+    updated_at = Column(DateTime, nullable=True, server_default=func.now(), onupdate=func.now())
+
+    # Ordered (timestamp, employee_number) indexes behind the latest entry and
+    # sorts, and the composite indexes behind the listing filters
+    __table_args__ = (
+        Index("idx_employee_updated", "updated_at", "employee_number"),
+        Index("idx_employee_created", "created_at", "employee_number"),
+        Index("idx_employee_attrition_age", "attrition", "age", "employee_number"),
+        Index("idx_employee_age", "age", "employee_number"),
+    )
 
     job_details = relationship(
         "JobDetail",
@@ -28,6 +38,30 @@ class Employee(Base):
         lazy="joined",  # helps prefetch related record
     )
 
+    # The remaining normalized tables are only read by the profile queries,
+    # which join them in explicitly; "raise" turns an accidental N+1 into an error
+    compensation = relationship(
+        "Compensation",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
+    )
+    performance_metrics = relationship(
+        "PerformanceMetrics",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
+    )
+    satisfaction_scores = relationship(
+        "SatisfactionScores",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise",
+    )
+
 
 class Department(Base):
     __tablename__ = "departments"
@@ -38,6 +72,11 @@ class Department(Base):
 
 class JobDetail(Base):
     __tablename__ = "job_details"
+    __table_args__ = (
+        Index("idx_job_department_role", "department_id", "job_role", "employee_number"),
+        Index("idx_job_role_level", "job_role", "job_level"),
+        Index("idx_job_level", "job_level", "job_id"),
+    )
 
     job_id = Column(Integer, primary_key=True, autoincrement=True, nullable=False)
     employee_number = Column(
@@ -56,4 +95,113 @@ class JobDetail(Base):
     job_involvement = Column(Integer, nullable=True, default=3)
     business_travel = Column(String(50), nullable=True, default="Travel_Rarely")
     employee = relationship("Employee", back_populates="job_details", lazy="joined")
-    overtime = Column(String(3), nullable=True, default="No") 
+    overtime = Column(String(3), nullable=True, default="No")
+    standard_hours = Column(Integer, nullable=True, default=80)
+    department = relationship("Department", lazy="raise")
+
+
+class Compensation(Base):
+    __tablename__ = "compensation"
+
+    compensation_id = Column(Integer, primary_key=True, autoincrement=True, nullable=False)
+    employee_number = Column(
+        Integer,
+        ForeignKey("employees.employee_number", ondelete="CASCADE"),
+        unique=True,
+        nullable=False,
+    )
+    daily_rate = Column(Integer, nullable=False)
+    hourly_rate = Column(Integer, nullable=False)
+    monthly_income = Column(Integer, nullable=False)
+    monthly_rate = Column(Integer, nullable=False)
+    percent_salary_hike = Column(Integer, nullable=False)
+    stock_option_level = Column(Integer, nullable=False)
+    last_salary_update = Column(DateTime, nullable=True, server_default=func.now())
+
+
+class PerformanceMetrics(Base):
+    __tablename__ = "performance_metrics"
+
+    performance_id = Column(Integer, primary_key=True, autoincrement=True, nullable=False)
+    employee_number = Column(
+        Integer,
+        ForeignKey("employees.employee_number", ondelete="CASCADE"),
+        unique=True,
+        nullable=False,
+    )
+    performance_rating = Column(Integer, nullable=False)
+    years_at_company = Column(Integer, nullable=False)
+    years_in_current_role = Column(Integer, nullable=False)
+    years_since_last_promotion = Column(Integer, nullable=False)
+    years_with_curr_manager = Column(Integer, nullable=False)
+    total_working_years = Column(Integer, nullable=False)
+    num_companies_worked = Column(Integer, nullable=False)
+    training_times_last_year = Column(Integer, nullable=False)
+    last_evaluation_date = Column(Date, nullable=True)
+
+
+class SatisfactionScores(Base):
+    __tablename__ = "satisfaction_scores"
+
+    satisfaction_id = Column(Integer, primary_key=True, autoincrement=True, nullable=False)
+    employee_number = Column(
+        Integer,
+        ForeignKey("employees.employee_number", ondelete="CASCADE"),
+        unique=True,
+        nullable=False,
+    )
+    environment_satisfaction = Column(Integer, nullable=False)
+    job_satisfaction = Column(Integer, nullable=False)
+    relationship_satisfaction = Column(Integer, nullable=False)
+    work_life_balance = Column(Integer, nullable=False)
+    survey_date = Column(Date, nullable=True)
+
+
+class DepartmentStats(Base):
+    """
+    Per-department running totals behind GET /mysql/departments/stats.
+    Kept up to date by the employee and job detail writes; one row per
+    job_details row of the department counts towards it.
+    """
+    __tablename__ = "department_stats"
+
+    department_id = Column(
+        Integer,
+        ForeignKey("departments.department_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    employee_count = Column(Integer, nullable=False, default=0)
+    attrition_count = Column(Integer, nullable=False, default=0)
+    job_satisfaction_sum = Column(Integer, nullable=False, default=0)
+    job_satisfaction_count = Column(Integer, nullable=False, default=0)
+    environment_satisfaction_sum = Column(Integer, nullable=False, default=0)
+    relationship_satisfaction_sum = Column(Integer, nullable=False, default=0)
+    work_life_balance_sum = Column(Integer, nullable=False, default=0)
+    satisfaction_count = Column(Integer, nullable=False, default=0)
+    monthly_income_sum = Column(BigInteger, nullable=False, default=0)
+    income_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True, server_default=func.now(), onupdate=func.now())
+    department = relationship("Department", lazy="joined")
+
+
+class EmployeeChange(Base):
+    """
+    Append-only log behind GET /mysql/employees/changes, written by the
+    employees insert/update triggers. change_id is the feed cursor.
+    """
+    __tablename__ = "employee_changes"
+
+    change_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    employee_number = Column(Integer, nullable=False)
+    changed_at = Column(DateTime, nullable=False)
+
+
+class IdBlock(Base):
+    """
+    Counters handing out blocks of explicit keys (employee numbers), for
+    tables whose key is not AUTO_INCREMENT. next_id is the first unused value.
+    """
+    __tablename__ = "id_blocks"
+
+    name = Column(String(50), primary_key=True)
+    next_id = Column(BigInteger, nullable=False)
@@ -1,3 +1,4 @@
+from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
 import os
 from dotenv import load_dotenv
@@ -7,13 +8,27 @@ load_dotenv()  # Load environment variables from .env
 MONGO_URL = os.getenv("MONGO_URL")
 MONGO_DB = os.getenv("MONGO_DB")
 
+# Connection pool sizing (per client). Requests beyond MONGO_MAX_POOL_SIZE wait up
+# to MONGO_WAIT_QUEUE_TIMEOUT_MS for a free connection (0 waits indefinitely)
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 100))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 0))
+
 if not MONGO_URL or not MONGO_DB:
     raise ValueError("MongoDB environment variables are missing. Check your .env file.")
 
-# Connect to MongoDB
-client = MongoClient(MONGO_URL)
+pool_options = dict(
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS or None,
+)
 
-# Select the database
+# Blocking client, kept for scripts and tools outside the API
+client = MongoClient(MONGO_URL, **pool_options)
 mongo_db = client[MONGO_DB]
 
+# Motor client used by the Mongo routers; requests wait on the event loop, not on worker threads
+async_client = AsyncIOMotorClient(MONGO_URL, **pool_options)
+async_mongo_db = async_client[MONGO_DB]
+
 print(f"✅ Connected to MongoDB database: {MONGO_DB}")
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import Optional
 
 from task_2_api import schemas
-from ..mongo_database import mongo_db
+from ..mongo_database import async_mongo_db
 from ..mongodb_crud import employees_crud as crud
-from ..mongodb_schemas import Employee, EmployeeBase
+from ..mongodb_schemas import BulkEmployeeResult, Employee, EmployeeBase
+from ..pagination import set_next_cursor
+from ..export import EXPORT_BATCH_SIZE, EXPORT_FORMAT_PATTERN, export_response
 
 router = APIRouter(
     prefix="/mongo/employees",
@@ -12,9 +14,11 @@ router = APIRouter(
 )
 
 @router.get("/")
-def get_employees(
+async def get_employees(
+    response: Response,
     skip: int = Query(0, description="Number of records to skip for pagination"),
     limit: int = Query(10, description="Number of records to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page; replaces skip"),
     gender: Optional[str] = Query(None, description="Filter by gender"),
     attrition: Optional[str] = Query(None, description="Filter by attrition"),
     education_field: Optional[str] = Query(None, description="Filter by education field"),
@@ -28,30 +32,57 @@ def get_employees(
     if education_field:
         filters["education_field"] = education_field
 
-    employees = crud.get_employees(mongo_db, skip=skip, limit=limit, filters=filters)
+    employees = await crud.get_employees(async_mongo_db, skip=skip, limit=limit, filters=filters, cursor=cursor)
+    set_next_cursor(response, employees, limit, lambda emp: {"_id": emp["_id"]})
     return employees
 
 
+@router.get("/export")
+async def export_employees(
+    format: str = Query("ndjson", pattern=EXPORT_FORMAT_PATTERN),
+    gender: Optional[str] = Query(None, description="Filter by gender"),
+    attrition: Optional[str] = Query(None, description="Filter by attrition"),
+    education_field: Optional[str] = Query(None, description="Filter by education field"),
+):
+    """Stream every (matching) employee as NDJSON or CSV; embedded documents become dotted CSV columns"""
+    filters = {}
+    if gender:
+        filters["gender"] = gender
+    if attrition:
+        filters["attrition"] = attrition
+    if education_field:
+        filters["education_field"] = education_field
+
+    batches = crud.stream_employees(async_mongo_db, EXPORT_BATCH_SIZE, filters)
+    return export_response(batches, format, "employees")
+
+
 @router.get("/{employee_id}")
-def get_employee(employee_id: str):
-    emp = crud.get_employee(mongo_db, employee_id)
+async def get_employee(employee_id: str):
+    emp = await crud.get_employee(async_mongo_db, employee_id)
     if not emp:
         raise HTTPException(status_code=404, detail="Employee not found")
     return emp
 
 
 @router.post("/", response_model=Employee) 
-def create_employee(employee: EmployeeBase):
-    return crud.create_employee(mongo_db, employee.dict())
+async def create_employee(employee: EmployeeBase):
+    return await crud.create_employee(async_mongo_db, employee.dict())
+
+
+@router.post("/bulk", response_model=list[BulkEmployeeResult])
+async def create_employees_bulk(employees: list[EmployeeBase]):
+    """Create many employees with one insert_many; returns the _id or error of each item, in order"""
+    return await crud.create_employees_bulk(async_mongo_db, [employee.dict() for employee in employees])
 
 
 @router.put("/{employee_id}", response_model=Employee)
-def update_employee(employee_id: str, employee: EmployeeBase):
-    updated = crud.update_employee(mongo_db, employee_id, employee.dict())
+async def update_employee(employee_id: str, employee: EmployeeBase):
+    updated = await crud.update_employee(async_mongo_db, employee_id, employee.dict())
     if not updated:
         raise HTTPException(status_code=404, detail="Employee not found")
     return updated
 
 @router.delete("/{employee_id}")
-def delete_employee(employee_id: str):
-    return crud.delete_employee(mongo_db, employee_id)
+async def delete_employee(employee_id: str):
+    return await crud.delete_employee(async_mongo_db, employee_id)
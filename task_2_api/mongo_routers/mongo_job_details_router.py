@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from .. import mongodb_schemas as schemas
 from ..mongodb_crud import job_details_crud as crud
+from ..pagination import set_next_cursor
 
 router = APIRouter(
     prefix="/mongo/job_details",
@@ -9,33 +10,37 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=schemas.JobDetail)
-def create_job_detail(job_detail: schemas.JobDetailCreate):
-    return crud.create_job_detail(job_detail.model_dump())
+async def create_job_detail(job_detail: schemas.JobDetailCreate):
+    return await crud.create_job_detail(job_detail.model_dump())
 
 @router.get("/", response_model=List[schemas.JobDetail])
-def list_job_details(
+async def list_job_details(
+    response: Response,
     skip: int = Query(0, ge=0),
-    limit: int = Query(10, le=100)
+    limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page")
 ):
-    return crud.get_job_details(skip=skip, limit=limit)
+    jobs = await crud.get_job_details(skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, jobs, limit, lambda job: {"job_id": job["job_id"]})
+    return jobs
 
 @router.get("/{job_id}", response_model=schemas.JobDetail)
-def get_job_detail(job_id: str):
-    job = crud.get_job_detail(job_id)
+async def get_job_detail(job_id: str):
+    job = await crud.get_job_detail(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job detail not found")
     return job
 
 @router.put("/{job_id}", response_model=schemas.JobDetail)
-def update_job_detail(job_id: str, job_detail: schemas.JobDetailCreate):
-    updated = crud.update_job_detail(job_id, job_detail.model_dump())
+async def update_job_detail(job_id: str, job_detail: schemas.JobDetailCreate):
+    updated = await crud.update_job_detail(job_id, job_detail.model_dump())
     if not updated:
         raise HTTPException(status_code=404, detail="Job detail not found or not updated")
     return updated
 
 @router.delete("/{job_id}")
-def delete_job_detail(job_id: str):
-    deleted = crud.delete_job_detail(job_id)
+async def delete_job_detail(job_id: str):
+    deleted = await crud.delete_job_detail(job_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Job detail not found or already deleted")
     return {"message": f"Job detail {job_id} deleted successfully"}
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import Optional
 from datetime import datetime
 
-from ..mongo_database import mongo_db
+from ..mongo_database import async_mongo_db
 from ..mongodb_crud import predictions_crud as crud
 from ..mongodb_schemas import Prediction, PredictionCreate
+from ..pagination import set_next_cursor
 
 router = APIRouter(
     prefix="/mongo/predictions",
@@ -13,7 +14,7 @@ router = APIRouter(
 
 
 @router.post("/", response_model=Prediction, status_code=201)
-def create_prediction(prediction: PredictionCreate):
+async def create_prediction(prediction: PredictionCreate):
     """
     Create a new prediction record.
     
@@ -26,7 +27,7 @@ def create_prediction(prediction: PredictionCreate):
         if not prediction_data.get("prediction_date"):
             prediction_data["prediction_date"] = datetime.utcnow()
         
-        created_prediction = crud.create_prediction(mongo_db, prediction_data)
+        created_prediction = await crud.create_prediction(async_mongo_db, prediction_data)
         
         if not created_prediction:
             raise HTTPException(status_code=500, detail="Failed to create prediction")
@@ -38,9 +39,11 @@ def create_prediction(prediction: PredictionCreate):
 
 
 @router.get("/", response_model=list[Prediction])
-def get_predictions(
+async def get_predictions(
+    response: Response,
     skip: int = Query(0, description="Number of records to skip for pagination"),
     limit: int = Query(10, description="Number of records to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page; replaces skip"),
     employee_number: Optional[int] = Query(None, description="Filter by employee number")
 ):
     """
@@ -50,16 +53,23 @@ def get_predictions(
     if employee_number is not None:
         filters["employee_number"] = employee_number
     
-    predictions = crud.get_predictions(mongo_db, skip=skip, limit=limit, filters=filters)
+    predictions = await crud.get_predictions(async_mongo_db, skip=skip, limit=limit, filters=filters, cursor=cursor)
+    # Dates sort ahead of missing or non-date values, so a page ending on one of
+    # those has no (prediction_date, _id) position to resume from; use skip there
+    if predictions and isinstance(predictions[-1].get("prediction_date"), datetime):
+        set_next_cursor(
+            response, predictions, limit,
+            lambda pred: {"prediction_date": pred["prediction_date"].isoformat(), "_id": pred["_id"]},
+        )
     return predictions
 
 
 @router.get("/{prediction_id}", response_model=Prediction)
-def get_prediction(prediction_id: str):
+async def get_prediction(prediction_id: str):
     """
     Get a specific prediction by ID.
     """
-    prediction = crud.get_prediction(mongo_db, prediction_id)
+    prediction = await crud.get_prediction(async_mongo_db, prediction_id)
     
     if not prediction:
         raise HTTPException(status_code=404, detail="Prediction not found")
@@ -68,13 +78,13 @@ def get_prediction(prediction_id: str):
 
 
 @router.get("/employee/{employee_number}", response_model=list[Prediction])
-def get_predictions_by_employee(
+async def get_predictions_by_employee(
     employee_number: int,
     limit: int = Query(10, description="Number of records to return")
 ):
     """
     Get all predictions for a specific employee number.
     """
-    predictions = crud.get_predictions_by_employee(mongo_db, employee_number, limit=limit)
+    predictions = await crud.get_predictions_by_employee(async_mongo_db, employee_number, limit=limit)
     return predictions
 
@@ -1,5 +1,6 @@
 from bson import ObjectId
-from ..mongo_database import mongo_db as db
+from ..mongo_database import async_mongo_db as db
+from ..pagination import decode_cursor
 
 departments = db["departments"]
 
@@ -10,21 +11,27 @@ def serialize_department(dept):
     dept["department_id"] = str(dept.pop("_id")) 
     return dept
 
-def get_departments(skip=0, limit=10):
-    results = list(departments.find().skip(skip).limit(limit))
-    return [serialize_department(d) for d in results]
+async def get_departments(skip=0, limit=10, cursor=None):
+    # Listing pages are cached by the response cache middleware, not the reference cache
+    if cursor:
+        # Keyset paging: seek past the last _id instead of skipping documents
+        (after,) = decode_cursor(cursor, {"department_id": ObjectId})
+        query = departments.find({"_id": {"$gt": after}})
+    else:
+        query = departments.find().skip(skip)
+    return [serialize_department(d) for d in await query.sort("_id", 1).limit(limit).to_list(length=limit)]
 
-def get_department(id: str):
-    return serialize_department(departments.find_one({"_id": ObjectId(id)}))
+async def get_department(id: str):
+    return serialize_department(await departments.find_one({"_id": ObjectId(id)}))
 
-def create_department(data: dict):
-    result = departments.insert_one(data)
-    return serialize_department(departments.find_one({"_id": result.inserted_id}))
+async def create_department(data: dict):
+    result = await departments.insert_one(data)
+    return serialize_department(await departments.find_one({"_id": result.inserted_id}))
 
-def update_department(id: str, data: dict):
-    departments.update_one({"_id": ObjectId(id)}, {"$set": data})
-    return serialize_department(departments.find_one({"_id": ObjectId(id)}))
+async def update_department(id: str, data: dict):
+    await departments.update_one({"_id": ObjectId(id)}, {"$set": data})
+    return serialize_department(await departments.find_one({"_id": ObjectId(id)}))
 
-def delete_department(id: str):
-    result = departments.delete_one({"_id": ObjectId(id)})
+async def delete_department(id: str):
+    result = await departments.delete_one({"_id": ObjectId(id)})
     return result.deleted_count > 0
@@ -1,14 +1,22 @@
+from datetime import datetime
 from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from ..pagination import decode_cursor
 
-def get_employees(mongo_db, skip: int = 0, limit: int = 10, filters: dict = None):
+async def get_employees(mongo_db, skip: int = 0, limit: int = 10, filters: dict = None, cursor: str = None):
     employees_collection = mongo_db["employees"]
 
     # Apply filters if provided
-    query = filters if filters else {}
+    query = dict(filters) if filters else {}
 
-    # Query with pagination
-    cursor = employees_collection.find(query).skip(skip).limit(limit)
-    data = list(cursor)
+    # Query with pagination: keyset on _id when a cursor is given, offset otherwise
+    if cursor:
+        (after,) = decode_cursor(cursor, {"_id": ObjectId})
+        query["_id"] = {"$gt": after}
+        results = employees_collection.find(query)
+    else:
+        results = employees_collection.find(query).skip(skip)
+    data = await results.sort("_id", 1).limit(limit).to_list(length=limit)
 
     # Convert ObjectId to string
     for item in data:
@@ -18,40 +26,102 @@ def get_employees(mongo_db, skip: int = 0, limit: int = 10, filters: dict = None
     return data
 
 
-def get_employee(mongo_db, employee_id: str):
+async def stream_employees(mongo_db, batch_size: int, filters: dict = None):
+    """Yield batches of employee documents in _id order, fetched batch_size at a time"""
     employees_collection = mongo_db["employees"]
-    employee = employees_collection.find_one({"_id": ObjectId(employee_id)})
+    cursor = employees_collection.find(filters or {}, batch_size=batch_size).sort("_id", 1)
+
+    batch = []
+    async for item in cursor:
+        item["_id"] = str(item["_id"])
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def get_employee(mongo_db, employee_id: str):
+    employees_collection = mongo_db["employees"]
+    employee = await employees_collection.find_one({"_id": ObjectId(employee_id)})
     if employee:
         employee["_id"] = str(employee["_id"])
     return employee
 
-def create_employee(mongo_db, employee_data: dict):
+def new_metadata():
+    """
+    metadata block of an employee created through the API. Like the importer's, it
+    carries updated_at, the watermark field of mongodb_risk_scoring.py.
+    """
+    now = datetime.now()
+    return {"created_at": now, "updated_at": now, "data_source": "api"}
+
+async def create_employee(mongo_db, employee_data: dict):
     employees_collection = mongo_db["employees"]
 
     # Auto-generate employee_number
-    last = employees_collection.find_one(sort=[("employee_number", -1)])
+    last = await employees_collection.find_one(sort=[("employee_number", -1)])
     next_number = (last["employee_number"] + 1) if last and "employee_number" in last else 1
     employee_data["employee_number"] = next_number
+    employee_data["metadata"] = new_metadata()
 
-    result = employees_collection.insert_one(employee_data)
+    result = await employees_collection.insert_one(employee_data)
 
-    new_emp = employees_collection.find_one({"_id": result.inserted_id})
+    new_emp = await employees_collection.find_one({"_id": result.inserted_id})
     new_emp["_id"] = str(new_emp["_id"])  # ✅ Make sure this line exists
 
     return new_emp
 
-def update_employee(mongo_db, employee_id: str, update_data: dict):
+async def create_employees_bulk(mongo_db, employees_data: list):
+    """
+    Insert many employees with one unordered insert_many, numbered after the
+    current highest employee_number. Returns one result per input item.
+    """
+    employees_collection = mongo_db["employees"]
+
+    last = await employees_collection.find_one(sort=[("employee_number", -1)], projection={"employee_number": 1})
+    next_number = (last["employee_number"] + 1) if last and "employee_number" in last else 1
+    metadata = new_metadata()
+    for offset, employee_data in enumerate(employees_data):
+        employee_data["employee_number"] = next_number + offset
+        employee_data["metadata"] = dict(metadata)
+
+    # Unordered: a rejected document does not stop the others
+    errors = {}
+    if employees_data:
+        try:
+            await employees_collection.insert_many(employees_data, ordered=False)
+        except BulkWriteError as e:
+            errors = {err["index"]: err["errmsg"] for err in e.details["writeErrors"]}
+
+    results = []
+    for index, employee_data in enumerate(employees_data):
+        result = {"index": index, "employee_number": employee_data["employee_number"]}
+        if index in errors:
+            result["error"] = errors[index]
+        else:
+            result["_id"] = str(employee_data["_id"])
+        results.append(result)
+    return results
+
+
+async def update_employee(mongo_db, employee_id: str, update_data: dict):
     employees_collection = mongo_db["employees"]
-    employees_collection.update_one({"_id": ObjectId(employee_id)}, {"$set": update_data})
-    updated_emp = employees_collection.find_one({"_id": ObjectId(employee_id)})
+    # Bumping metadata.updated_at queues the employee for the next risk scoring run
+    await employees_collection.update_one(
+        {"_id": ObjectId(employee_id)},
+        {"$set": {**update_data, "metadata.updated_at": datetime.now()}},
+    )
+    updated_emp = await employees_collection.find_one({"_id": ObjectId(employee_id)})
     if updated_emp:
         updated_emp["_id"] = str(updated_emp["_id"])
     return updated_emp
 
 
-def delete_employee(mongo_db, employee_id: str):
+async def delete_employee(mongo_db, employee_id: str):
     employees_collection = mongo_db["employees"]
-    result = employees_collection.delete_one({"_id": ObjectId(employee_id)})
+    result = await employees_collection.delete_one({"_id": ObjectId(employee_id)})
     if result.deleted_count == 1:
         return {"message": f"Employee {employee_id} deleted successfully"}
     else:
@@ -1,5 +1,6 @@
 from bson import ObjectId
-from ..mongo_database import mongo_db as db
+from ..mongo_database import async_mongo_db as db
+from ..pagination import decode_cursor
 
 collection = db["job_details"]
 
@@ -10,25 +11,31 @@ def serialize_job_detail(job):
     return job
 
 
-def create_job_detail(data: dict):
-    result = collection.insert_one(data)
-    return serialize_job_detail(collection.find_one({"_id": result.inserted_id}))
+async def create_job_detail(data: dict):
+    result = await collection.insert_one(data)
+    return serialize_job_detail(await collection.find_one({"_id": result.inserted_id}))
 
 
-def get_job_details(skip=0, limit=10):
-    jobs = list(collection.find().skip(skip).limit(limit))
+async def get_job_details(skip=0, limit=10, cursor=None):
+    if cursor:
+        # Keyset paging: seek past the last _id instead of skipping documents
+        (after,) = decode_cursor(cursor, {"job_id": ObjectId})
+        query = collection.find({"_id": {"$gt": after}})
+    else:
+        query = collection.find().skip(skip)
+    jobs = await query.sort("_id", 1).limit(limit).to_list(length=limit)
     return [serialize_job_detail(job) for job in jobs]
 
 
-def get_job_detail(id: str):
-    return serialize_job_detail(collection.find_one({"_id": ObjectId(id)}))
+async def get_job_detail(id: str):
+    return serialize_job_detail(await collection.find_one({"_id": ObjectId(id)}))
 
 
-def update_job_detail(id: str, data: dict):
-    collection.update_one({"_id": ObjectId(id)}, {"$set": data})
-    return serialize_job_detail(collection.find_one({"_id": ObjectId(id)}))
+async def update_job_detail(id: str, data: dict):
+    await collection.update_one({"_id": ObjectId(id)}, {"$set": data})
+    return serialize_job_detail(await collection.find_one({"_id": ObjectId(id)}))
 
 
-def delete_job_detail(id: str):
-    result = collection.delete_one({"_id": ObjectId(id)})
+async def delete_job_detail(id: str):
+    result = await collection.delete_one({"_id": ObjectId(id)})
     return result.deleted_count > 0
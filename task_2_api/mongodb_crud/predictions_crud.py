@@ -1,19 +1,32 @@
 from bson import ObjectId
 from datetime import datetime
+from ..pagination import decode_cursor
 
 
-def get_predictions(mongo_db, skip: int = 0, limit: int = 10, filters: dict = None):
+async def get_predictions(mongo_db, skip: int = 0, limit: int = 10, filters: dict = None, cursor: str = None):
     """
     Get predictions with pagination and optional filters.
+    Newest first; with a cursor the page starts after the (prediction_date, _id)
+    of the previous page's last prediction instead of skipping documents.
     """
     predictions_collection = mongo_db["predictions"]
     
     # Apply filters if provided
-    query = filters if filters else {}
+    query = dict(filters) if filters else {}
     
     # Query with pagination
-    cursor = predictions_collection.find(query).sort("prediction_date", -1).skip(skip).limit(limit)
-    data = list(cursor)
+    if cursor:
+        last_date, last_id = decode_cursor(
+            cursor, {"prediction_date": datetime.fromisoformat, "_id": ObjectId}
+        )
+        query["$or"] = [
+            {"prediction_date": {"$lt": last_date}},
+            {"prediction_date": last_date, "_id": {"$lt": last_id}},
+        ]
+        results = predictions_collection.find(query)
+    else:
+        results = predictions_collection.find(query).skip(skip)
+    data = await results.sort([("prediction_date", -1), ("_id", -1)]).limit(limit).to_list(length=limit)
     
     # Convert ObjectId to string
     for item in data:
@@ -23,12 +36,12 @@ def get_predictions(mongo_db, skip: int = 0, limit: int = 10, filters: dict = No
     return data
 
 
-def get_prediction(mongo_db, prediction_id: str):
+async def get_prediction(mongo_db, prediction_id: str):
     """
     Get a single prediction by ID.
     """
     predictions_collection = mongo_db["predictions"]
-    prediction = predictions_collection.find_one({"_id": ObjectId(prediction_id)})
+    prediction = await predictions_collection.find_one({"_id": ObjectId(prediction_id)})
     
     if prediction:
         prediction["_id"] = str(prediction["_id"])
@@ -36,7 +49,7 @@ def get_prediction(mongo_db, prediction_id: str):
     return prediction
 
 
-def create_prediction(mongo_db, prediction_data: dict):
+async def create_prediction(mongo_db, prediction_data: dict):
     """
     Create a new prediction record in MongoDB.
     No foreign key constraints - we just store the employee_number.
@@ -48,10 +61,10 @@ def create_prediction(mongo_db, prediction_data: dict):
         prediction_data["prediction_date"] = datetime.utcnow()
     
     # Insert the prediction
-    result = predictions_collection.insert_one(prediction_data)
+    result = await predictions_collection.insert_one(prediction_data)
     
     # Fetch and return the created prediction
-    new_prediction = predictions_collection.find_one({"_id": result.inserted_id})
+    new_prediction = await predictions_collection.find_one({"_id": result.inserted_id})
     
     if new_prediction:
         new_prediction["_id"] = str(new_prediction["_id"])
@@ -59,7 +72,7 @@ def create_prediction(mongo_db, prediction_data: dict):
     return new_prediction
 
 
-def get_predictions_by_employee(mongo_db, employee_number: int, limit: int = 10):
+async def get_predictions_by_employee(mongo_db, employee_number: int, limit: int = 10):
     """
     Get predictions for a specific employee number.
     """
@@ -69,7 +82,7 @@ def get_predictions_by_employee(mongo_db, employee_number: int, limit: int = 10)
         {"employee_number": employee_number}
     ).sort("prediction_date", -1).limit(limit)
     
-    data = list(cursor)
+    data = await cursor.to_list(length=limit)
     
     # Convert ObjectId to string
     for item in data:
@@ -65,6 +65,15 @@ class Employee(EmployeeBase):
         json_encoders={ObjectId: str},
     )
 
+class BulkEmployeeResult(BaseModel):
+    """Outcome of one item of a bulk create: its _id, or the error the server returned."""
+    index: int
+    employee_number: int
+    id: Optional[PyObjectId] = Field(default=None, alias="_id")
+    error: Optional[str] = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
 class DepartmentBase(BaseModel):
     department_name: str
     employee_count: int
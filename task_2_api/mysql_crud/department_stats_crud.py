@@ -0,0 +1,127 @@
+from collections import defaultdict
+from sqlalchemy import func, select
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import models
+
+# Running totals kept per department in department_stats
+STAT_COLUMNS = (
+    "employee_count",
+    "attrition_count",
+    "job_satisfaction_sum",
+    "job_satisfaction_count",
+    "environment_satisfaction_sum",
+    "relationship_satisfaction_sum",
+    "work_life_balance_sum",
+    "satisfaction_count",
+    "monthly_income_sum",
+    "income_count",
+)
+
+def new_totals():
+    return defaultdict(lambda: dict.fromkeys(STAT_COLUMNS, 0))
+
+def add_contribution(totals, department_id, attrition, job_satisfaction=None,
+                     satisfaction=None, monthly_income=None):
+    """
+    Add what one job_details row counts towards its department.
+    satisfaction is an (environment, relationship, work-life balance) tuple or None.
+    """
+    if department_id is None:
+        return totals
+    stats = totals[department_id]
+    stats["employee_count"] += 1
+    stats["attrition_count"] += attrition == "Yes"
+    if job_satisfaction is not None:
+        stats["job_satisfaction_sum"] += job_satisfaction
+        stats["job_satisfaction_count"] += 1
+    if satisfaction is not None and satisfaction[0] is not None:
+        environment, relationship, work_life_balance = satisfaction
+        stats["environment_satisfaction_sum"] += environment
+        stats["relationship_satisfaction_sum"] += relationship
+        stats["work_life_balance_sum"] += work_life_balance
+        stats["satisfaction_count"] += 1
+    if monthly_income is not None:
+        stats["monthly_income_sum"] += monthly_income
+        stats["income_count"] += 1
+    return totals
+
+async def employee_contributions(db: AsyncSession, *employee_numbers: int):
+    """
+    Per-department totals of the job_details rows of the given employees as
+    currently stored (pending changes are flushed first). Taken before and
+    after a write, the difference is what the write changes in the summary.
+    """
+    totals = new_totals()
+    employee_numbers = [n for n in employee_numbers if n is not None]
+    if not employee_numbers:
+        return totals
+
+    await db.flush()
+    query = (
+        select(
+            models.JobDetail.department_id,
+            models.Employee.attrition,
+            models.JobDetail.job_satisfaction,
+            models.SatisfactionScores.environment_satisfaction,
+            models.SatisfactionScores.relationship_satisfaction,
+            models.SatisfactionScores.work_life_balance,
+            models.Compensation.monthly_income,
+        )
+        .join(models.Employee, models.Employee.employee_number == models.JobDetail.employee_number)
+        .outerjoin(models.SatisfactionScores, models.SatisfactionScores.employee_number == models.JobDetail.employee_number)
+        .outerjoin(models.Compensation, models.Compensation.employee_number == models.JobDetail.employee_number)
+        .filter(models.JobDetail.employee_number.in_(employee_numbers))
+    )
+    result = await db.execute(query)
+    for department_id, attrition, job_satisfaction, environment, relationship, balance, income in result.all():
+        add_contribution(totals, department_id, attrition, job_satisfaction,
+                         (environment, relationship, balance), income)
+    return totals
+
+async def adjust_department_stats(db: AsyncSession, before: dict, after: dict):
+    """
+    Apply after - before to department_stats in the caller's transaction, with
+    one INSERT ... ON DUPLICATE KEY UPDATE col = col + delta for all departments
+    that changed. Concurrent writers add their deltas under the row lock instead
+    of overwriting each other.
+    """
+    rows = []
+    for department_id in set(before) | set(after):
+        old = before.get(department_id, {})
+        new = after.get(department_id, {})
+        deltas = {col: new.get(col, 0) - old.get(col, 0) for col in STAT_COLUMNS}
+        if any(deltas.values()):
+            rows.append({"department_id": department_id, **deltas})
+    if not rows:
+        return
+
+    stmt = insert(models.DepartmentStats).values(rows)
+    stmt = stmt.on_duplicate_key_update(
+        updated_at=func.now(),
+        **{col: getattr(models.DepartmentStats, col) + stmt.inserted[col] for col in STAT_COLUMNS},
+    )
+    await db.execute(stmt)
+
+def average(total, count):
+    return round(total / count, 2) if count else None
+
+async def get_department_stats(db: AsyncSession):
+    """Read the summary: one row per department, however many employees there are"""
+    result = await db.execute(select(models.DepartmentStats).order_by(models.DepartmentStats.department_id))
+    return [
+        {
+            "department_id": stats.department_id,
+            "department_name": stats.department.department_name,
+            "employee_count": stats.employee_count,
+            "attrition_count": stats.attrition_count,
+            "attrition_rate": round(stats.attrition_count / stats.employee_count * 100, 2) if stats.employee_count else 0.0,
+            "avg_job_satisfaction": average(stats.job_satisfaction_sum, stats.job_satisfaction_count),
+            "avg_environment_satisfaction": average(stats.environment_satisfaction_sum, stats.satisfaction_count),
+            "avg_relationship_satisfaction": average(stats.relationship_satisfaction_sum, stats.satisfaction_count),
+            "avg_work_life_balance": average(stats.work_life_balance_sum, stats.satisfaction_count),
+            "avg_monthly_income": average(stats.monthly_income_sum, stats.income_count),
+            "updated_at": stats.updated_at,
+        }
+        for stats in result.scalars().all()
+    ]
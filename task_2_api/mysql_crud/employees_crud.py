@@ -1,126 +1,363 @@
-from sqlalchemy.orm import Session
+import os
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, lazyload
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
 from .. import models, schemas
+from ..database import AsyncSessionLocal
+from ..pagination import decode_cursor, encode_cursor, keyset_paginate
+from ..reference_cache import department_cache
+from .department_stats_crud import add_contribution, adjust_department_stats, employee_contributions, new_totals
 
-def get_employees(db: Session, skip: int = 0, limit: int = 10):
-    return db.query(models.Employee).offset(skip).limit(limit).all()
+# Largest number of employees accepted by one bulk request, and rows per INSERT statement
+BULK_MAX_EMPLOYEES = 10000
+BULK_INSERT_CHUNK = 1000
 
-def get_employee(db: Session, employee_number: int):
-    return db.query(models.Employee).filter(models.Employee.employee_number == employee_number).first()
+# The change feed only returns changes logged at least this long ago, so a
+# transaction still holding a lower change_id commits before the cursor passes it
+CHANGE_FEED_LAG_SECONDS = float(os.getenv("CHANGE_FEED_LAG_SECONDS", 5))
 
-def create_employee(db: Session, employee: schemas.EmployeeCreate):
-    db_emp = models.Employee(**employee.dict(exclude={"department_name", "job_satisfaction", "job_involvement"}))
+def filter_employees(query, filters: dict = None):
+    """
+    Compile the listing filters into WHERE clauses. Department and job role
+    filters join job_details (and departments) on their indexed keys.
+    """
+    filters = filters or {}
+    if filters.get("attrition"):
+        query = query.filter(models.Employee.attrition == filters["attrition"])
+    if filters.get("gender"):
+        query = query.filter(models.Employee.gender == filters["gender"])
+    if filters.get("min_age") is not None:
+        query = query.filter(models.Employee.age >= filters["min_age"])
+    if filters.get("max_age") is not None:
+        query = query.filter(models.Employee.age <= filters["max_age"])
+
+    if filters.get("department") or filters.get("job_role"):
+        query = query.join(models.JobDetail, models.JobDetail.employee_number == models.Employee.employee_number)
+        if filters.get("job_role"):
+            query = query.filter(models.JobDetail.job_role == filters["job_role"])
+        if filters.get("department"):
+            query = query.join(models.Department, models.Department.department_id == models.JobDetail.department_id)
+            query = query.filter(models.Department.department_name == filters["department"])
+    return query
+
+def paginate_employees(query, skip: int = 0, limit: int = 10, cursor: str = None, sort: str = "employee_number"):
+    # Keyset paging when a cursor is given: seek past the last (sort value, employee_number) on its index
+    return keyset_paginate(query, models.Employee, "employee_number", sort, skip, limit, cursor)
+
+async def get_employees(db: AsyncSession, skip: int = 0, limit: int = 10, cursor: str = None,
+                        sort: str = "employee_number", filters: dict = None):
+    query = filter_employees(select(models.Employee), filters)
+    result = await db.execute(paginate_employees(query, skip, limit, cursor, sort))
+    return result.scalars().all()
+
+async def get_employee(db: AsyncSession, employee_number: int):
+    result = await db.execute(select(models.Employee).filter(models.Employee.employee_number == employee_number))
+    return result.scalars().first()
+
+async def stream_employees(batch_size: int):
+    """
+    Yield batches of employee rows (as dicts) in employee_number order from a
+    server-side cursor. Opens its own session, since the stream outlives the
+    request handler that started it.
+    """
+    query = (
+        select(*models.Employee.__table__.columns)
+        .order_by(models.Employee.employee_number)
+        .execution_options(yield_per=batch_size)
+    )
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query)
+        async for rows in result.mappings().partitions():
+            yield [dict(row) for row in rows]
+
+def profile_query():
+    """
+    Select employees with all five related tables joined in.
+    Every relationship is one-to-one, so a profile page is a single SELECT
+    however many employees it holds.
+    """
+    return select(models.Employee).options(
+        joinedload(models.Employee.job_details).joinedload(models.JobDetail.department),
+        joinedload(models.Employee.compensation),
+        joinedload(models.Employee.performance_metrics),
+        joinedload(models.Employee.satisfaction_scores),
+    )
+
+async def get_employee_profile(db: AsyncSession, employee_number: int):
+    result = await db.execute(profile_query().filter(models.Employee.employee_number == employee_number))
+    return result.scalars().first()
+
+async def get_employee_profiles(db: AsyncSession, skip: int = 0, limit: int = 10, cursor: str = None,
+                                sort: str = "employee_number", filters: dict = None):
+    query = filter_employees(profile_query(), filters)
+    result = await db.execute(paginate_employees(query, skip, limit, cursor, sort))
+    return result.scalars().all()
+
+async def get_department_by_name(db: AsyncSession, department_name: str):
+    result = await db.execute(select(models.Department).filter_by(department_name=department_name))
+    return result.scalars().first()
+
+async def get_department_id(db: AsyncSession, department_name: str):
+    """
+    Resolve a department name to its id, creating the department when missing.
+    Known departments come from the reference cache without a query. Returns
+    (department_id, created); the caller caches a created department once its
+    transaction has committed.
+    """
+    department_id = department_cache.get(("mysql", department_name))
+    if department_id is not None:
+        return department_id, False
+
+    dept = await get_department_by_name(db, department_name)
+    if dept:
+        department_cache.set(("mysql", department_name), dept.department_id)
+        return dept.department_id, False
+
+    dept = models.Department(department_name=department_name)
+    db.add(dept)
+    await db.flush()
+    return dept.department_id, True
+
+async def reserve_employee_numbers(count: int) -> int:
+    """
+    Reserve count consecutive employee numbers and return the first one. The
+    id_blocks counter is bumped in its own short transaction, so its row lock is
+    not held for the caller's whole write. Numbers written by the import scripts
+    are skipped by starting above the current highest employee_number.
+    """
+    block = models.IdBlock
+    next_free = func.greatest(
+        block.next_id,
+        select(func.coalesce(func.max(models.Employee.employee_number), 0) + 1).scalar_subquery(),
+    )
+    async with AsyncSessionLocal() as db:
+        # LAST_INSERT_ID(expr) hands the new value back on this connection
+        await db.execute(
+            update(block).where(block.name == "employees").values(next_id=func.last_insert_id(next_free + count))
+        )
+        end = (await db.execute(select(func.last_insert_id()))).scalar()
+        await db.commit()
+    return end - count
+
+async def create_employee(db: AsyncSession, employee: schemas.EmployeeCreate):
+    # Reserved before the request session checks out its connection
+    employee_number = await reserve_employee_numbers(1)
+    db_emp = models.Employee(
+        employee_number=employee_number,
+        **employee.dict(exclude={"department_name", "job_satisfaction", "job_involvement"}),
+    )
     db.add(db_emp)
-    db.flush() 
+    await db.flush()
 
-    dept_name = getattr(employee, "department_name", None)
+    dept_name = getattr(employee, "department_name", None) or "General"
     job_satisfaction = getattr(employee, "job_satisfaction", None)
     job_involvement = getattr(employee, "job_involvement", None)
 
-    if dept_name:
-        dept = db.query(models.Department).filter_by(department_name=dept_name).first()
-        if not dept:
-            dept = models.Department(department_name=dept_name)
-            db.add(dept)
-            db.flush()
-    else:
-        dept = db.query(models.Department).filter_by(department_name="General").first()
-        if not dept:
-            dept = models.Department(department_name="General")
-            db.add(dept)
-            db.flush()
-    
+    department_id, created = await get_department_id(db, dept_name)
+
     job_detail = models.JobDetail(
         employee_number=db_emp.employee_number,
-        department_id=dept.department_id,
+        department_id=department_id,
         job_role="Developer",
         job_level=2,
         job_satisfaction=job_satisfaction or 3,
         job_involvement=job_involvement or 3,
     )
     db.add(job_detail)
+    # A new employee has no satisfaction or compensation rows yet
+    await adjust_department_stats(db, {}, add_contribution(
+        new_totals(), department_id, db_emp.attrition, job_detail.job_satisfaction
+    ))
 
-    db.commit()
-    db.refresh(db_emp)
+    await db.commit()
+    if created:
+        department_cache.set(("mysql", dept_name), department_id)
+    await db.refresh(db_emp)
     return db_emp
 
-def update_employee(db: Session, employee_number: int, employee: schemas.EmployeeCreate):
-    db_emp = get_employee(db, employee_number)
+async def resolve_departments(db: AsyncSession, names: set):
+    """Map department names to ids from the cache, then one lookup, creating the missing ones in one statement"""
+    department_ids = {}
+    for name in names:
+        department_id = department_cache.get(("mysql", name))
+        if department_id is not None:
+            department_ids[name] = department_id
+
+    query = select(models.Department.department_name, models.Department.department_id)
+    uncached = names - department_ids.keys()
+    if uncached:
+        result = await db.execute(query.filter(models.Department.department_name.in_(uncached)))
+        department_ids.update(result.all())
+
+    missing = names - department_ids.keys()
+    if missing:
+        # IGNORE: a concurrent request may have created the same department meanwhile
+        await db.execute(
+            insert(models.Department).prefix_with("IGNORE", dialect="mysql"),
+            [{"department_name": name} for name in missing],
+        )
+        result = await db.execute(query.filter(models.Department.department_name.in_(missing)))
+        department_ids.update(result.all())
+    return department_ids
+
+async def insert_rows(db: AsyncSession, model, rows: list):
+    """Insert rows with multi-row INSERT statements of up to BULK_INSERT_CHUNK rows"""
+    for start in range(0, len(rows), BULK_INSERT_CHUNK):
+        await db.execute(insert(model).values(rows[start:start + BULK_INSERT_CHUNK]))
+
+async def create_employees_bulk(db: AsyncSession, employees: list):
+    """
+    Create many employees in one transaction: one department lookup, then
+    multi-row inserts of employees and job details. All or nothing.
+    """
+    if len(employees) > BULK_MAX_EMPLOYEES:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_EMPLOYEES} employees per request")
+    if not employees:
+        return []
+
+    dept_names = [emp.department_name or "General" for emp in employees]
+    # One block of employee numbers, reserved before the request session checks out its connection
+    first_number = await reserve_employee_numbers(len(employees))
+    employee_numbers = list(range(first_number, first_number + len(employees)))
+    try:
+        department_ids = await resolve_departments(db, set(dept_names))
+
+        employee_rows = [
+            dict(employee_number=employee_number,
+                 **emp.dict(exclude={"department_name", "job_satisfaction", "job_involvement"}))
+            for emp, employee_number in zip(employees, employee_numbers)
+        ]
+        await insert_rows(db, models.Employee, employee_rows)
+
+        job_rows = [
+            dict(
+                employee_number=employee_number,
+                department_id=department_ids[dept_name],
+                job_role="Developer",
+                job_level=2,
+                job_satisfaction=getattr(emp, "job_satisfaction", None) or 3,
+                job_involvement=getattr(emp, "job_involvement", None) or 3,
+            )
+            for emp, employee_number, dept_name in zip(employees, employee_numbers, dept_names)
+        ]
+        # job_id comes from AUTO_INCREMENT; read the ids back by employee_number in one SELECT
+        await insert_rows(db, models.JobDetail, job_rows)
+        result = await db.execute(
+            select(models.JobDetail.employee_number, models.JobDetail.job_id)
+            .filter(models.JobDetail.employee_number.in_(employee_numbers))
+        )
+        job_id_by_number = dict(result.all())
+
+        totals = new_totals()
+        for emp, row in zip(employees, job_rows):
+            add_contribution(totals, row["department_id"], emp.attrition, row["job_satisfaction"])
+        await adjust_department_stats(db, {}, totals)
+
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f"Bulk create failed: {str(e)}")
+
+    for name, department_id in department_ids.items():
+        department_cache.set(("mysql", name), department_id)
+
+    return [
+        {
+            "index": index,
+            "employee_number": employee_number,
+            "department_id": department_ids[dept_name],
+            "job_id": job_id_by_number[employee_number],
+        }
+        for index, (employee_number, dept_name) in enumerate(zip(employee_numbers, dept_names))
+    ]
+
+async def update_employee(db: AsyncSession, employee_number: int, employee: schemas.EmployeeCreate):
+    db_emp = await get_employee(db, employee_number)
     if not db_emp:
         raise HTTPException(status_code=404, detail="Employee not found")
+    before = await employee_contributions(db, employee_number)
 
     # update department if provided
+    created = False
     if employee.department_name:
-        dept = db.query(models.Department).filter_by(department_name=employee.department_name).first()
-        if not dept:
-            dept = models.Department(department_name=employee.department_name)
-            db.add(dept)
-            db.flush()
+        department_id, created = await get_department_id(db, employee.department_name)
 
-        job_detail = db.query(models.JobDetail).filter_by(employee_number=employee_number).first()
+        job_detail = db_emp.job_details
         if job_detail:
-            job_detail.department_id = dept.department_id
+            job_detail.department_id = department_id
 
     # update other fields
     for key, value in employee.dict(exclude={"department_name"}).items():
         setattr(db_emp, key, value)
+    # Any update, including a department-only one, moves updated_at, so the
+    # employees update trigger logs it for the change feed
+    db_emp.updated_at = func.now()
+    # Moves the employee between departments and/or attrition counts
+    await adjust_department_stats(db, before, await employee_contributions(db, employee_number))
 
-    db.commit()
-    db.refresh(db_emp)
+    await db.commit()
+    if created:
+        department_cache.set(("mysql", employee.department_name), department_id)
+    await db.refresh(db_emp)
     return db_emp
 
-def delete_employee(db: Session, employee_number: int):
-    employee = db.query(models.Employee).filter(models.Employee.employee_number == employee_number).first()
+async def delete_employee(db: AsyncSession, employee_number: int):
+    employee = await get_employee(db, employee_number)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
 
     try:
-        db.delete(employee)
-        db.commit()
+        # The employee's job_details, satisfaction and compensation rows go with it
+        await adjust_department_stats(db, await employee_contributions(db, employee_number), {})
+        await db.delete(employee)
+        await db.commit()
         return {"message": f"Employee {employee_number} deleted successfully"}
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail=f"Delete failed: {str(e)}")
 
-def get_latest_employee(db: Session):
+async def get_latest_employee(db: AsyncSession):
     """
     Get the latest employee entry by creation timestamp (created_at).
-    Falls back to highest employee_number if created_at column doesn't exist.
+    Reads the top of the (created_at, employee_number) index.
     """
-    from sqlalchemy import text
-    
-    try:
-        # Try to get latest by created_at timestamp (if column exists)
-        latest = db.query(models.Employee).order_by(
-            text("created_at DESC")
-        ).first()
-        
-        if latest:
-            return latest
-    except Exception:
-        # If created_at doesn't exist or query fails, fall back to employee_number
-        # But user doesn't want this, so we'll use raw SQL to check if column exists
-        pass
-    
-    # Check if created_at column exists using raw SQL
-    try:
-        result = db.execute(text(
-            "SELECT employee_number, created_at FROM employees ORDER BY created_at DESC LIMIT 1"
-        ))
-        row = result.fetchone()
-        if row:
-            employee_number = row[0]
-            return db.query(models.Employee).filter(
-                models.Employee.employee_number == employee_number
-            ).first()
-    except Exception:
-        # Column doesn't exist, we'll need to add it or use another method
-        pass
-    
-    # Last resort: Since we can't use employee_number, we'll use a limit of 1
-    # But this doesn't guarantee the latest. We should add created_at to the model.
-    return db.query(models.Employee).limit(1).first()
+    result = await db.execute(
+        select(models.Employee)
+        .order_by(models.Employee.created_at.desc(), models.Employee.employee_number.desc())
+        .limit(1)
+    )
+    return result.scalars().first()
 
+async def get_employee_changes(db: AsyncSession, since: str = None, limit: int = 100):
+    """
+    Get the employees changed after the since cursor, oldest change first, one
+    entry per employee_changes row with the employee's current values. Walks the
+    change log on its primary key, CHANGE_FEED_LAG_SECONDS behind the server
+    clock. The returned cursor resumes right after the last change, or stays at
+    since when nothing changed.
+    """
+    log = models.EmployeeChange
+    cutoff = func.timestampadd(text("MICROSECOND"), -int(CHANGE_FEED_LAG_SECONDS * 1e6), func.now(6))
+    query = (
+        select(models.Employee, log.change_id)
+        .join(log, log.employee_number == models.Employee.employee_number)
+        .filter(log.changed_at <= cutoff)
+        .options(lazyload(models.Employee.job_details))
+    )
+    if since:
+        (last_id,) = decode_cursor(since, {"change_id": int})
+        query = query.filter(log.change_id > last_id)
+    result = await db.execute(query.order_by(log.change_id).limit(limit))
+    rows = result.all()
 
+    columns = [column.name for column in models.Employee.__table__.columns]
+    changes = [
+        {**{name: getattr(employee, name) for name in columns}, "change_id": change_id}
+        for employee, change_id in rows
+    ]
+    next_cursor = since
+    if rows:
+        next_cursor = encode_cursor({"change_id": rows[-1].change_id})
+    return {"changes": changes, "next_cursor": next_cursor}
@@ -1,35 +1,50 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from .. import models, schemas
+from ..pagination import decode_cursor
+from ..reference_cache import department_cache
 
 #Department CRUD Operations
 
-def get_departments(db: Session, skip: int = 0, limit: int = 10):
-    return db.query(models.Department).offset(skip).limit(limit).all()
+async def get_departments(db: AsyncSession, skip: int = 0, limit: int = 10, cursor: str = None):
+    query = select(models.Department).order_by(models.Department.department_id)
+    if cursor:
+        # Keyset paging: seek past the last department_id on the primary key index
+        (after,) = decode_cursor(cursor, {"department_id": int})
+        query = query.filter(models.Department.department_id > after)
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
+    return result.scalars().all()
 
-def get_department(db: Session, department_id: int):
-    dept = db.query(models.Department).filter(models.Department.department_id == department_id).first()
+async def get_department(db: AsyncSession, department_id: int):
+    result = await db.execute(select(models.Department).filter(models.Department.department_id == department_id))
+    dept = result.scalars().first()
     if not dept:
         raise HTTPException(status_code=404, detail="Department not found")
     return dept
 
-def create_department(db: Session, department: schemas.DepartmentCreate):
+async def create_department(db: AsyncSession, department: schemas.DepartmentCreate):
     db_dept = models.Department(**department.dict())
     db.add(db_dept)
-    db.commit()
-    db.refresh(db_dept)
+    await db.commit()
+    department_cache.invalidate("mysql")
+    await db.refresh(db_dept)
     return db_dept
 
-def update_department(db: Session, department_id: int, department: schemas.DepartmentCreate):
-    db_dept = get_department(db, department_id)
+async def update_department(db: AsyncSession, department_id: int, department: schemas.DepartmentCreate):
+    db_dept = await get_department(db, department_id)
     db_dept.department_name = department.department_name
-    db.commit()
-    db.refresh(db_dept)
+    await db.commit()
+    department_cache.invalidate("mysql")
+    await db.refresh(db_dept)
     return db_dept
 
-def delete_department(db: Session, department_id: int):
-    db_dept = get_department(db, department_id)
-    db.delete(db_dept)
-    db.commit()
+async def delete_department(db: AsyncSession, department_id: int):
+    db_dept = await get_department(db, department_id)
+    await db.delete(db_dept)
+    await db.commit()
+    department_cache.invalidate("mysql")
     return {"message": f"Department {department_id} deleted successfully"}
\ No newline at end of file
@@ -1,35 +1,67 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from .. import models, schemas
+from ..pagination import keyset_paginate
+from .department_stats_crud import adjust_department_stats, employee_contributions
 
 
-def get_job_details(db: Session, skip: int = 0, limit: int = 10):
-    return db.query(models.JobDetail).offset(skip).limit(limit).all()
+def filter_job_details(query, filters: dict = None):
+    """Compile the listing filters into WHERE clauses on job_details"""
+    filters = filters or {}
+    if filters.get("department_id") is not None:
+        query = query.filter(models.JobDetail.department_id == filters["department_id"])
+    if filters.get("job_role"):
+        query = query.filter(models.JobDetail.job_role == filters["job_role"])
+    if filters.get("min_job_level") is not None:
+        query = query.filter(models.JobDetail.job_level >= filters["min_job_level"])
+    if filters.get("max_job_level") is not None:
+        query = query.filter(models.JobDetail.job_level <= filters["max_job_level"])
+    if filters.get("overtime"):
+        query = query.filter(models.JobDetail.overtime == filters["overtime"])
+    return query
 
-def get_job_detail(db: Session, job_id: int):
-    job = db.query(models.JobDetail).filter(models.JobDetail.job_id == job_id).first()
+async def get_job_details(db: AsyncSession, skip: int = 0, limit: int = 10, cursor: str = None,
+                          sort: str = "job_id", filters: dict = None):
+    query = filter_job_details(select(models.JobDetail), filters)
+    # Keyset paging when a cursor is given: seek past the last (sort value, job_id) on its index
+    query = keyset_paginate(query, models.JobDetail, "job_id", sort, skip, limit, cursor)
+    result = await db.execute(query)
+    return result.scalars().all()
+
+async def get_job_detail(db: AsyncSession, job_id: int):
+    result = await db.execute(select(models.JobDetail).filter(models.JobDetail.job_id == job_id))
+    job = result.scalars().first()
     if not job:
         raise HTTPException(status_code=404, detail="Job detail not found")
     return job
 
-def create_job_detail(db: Session, job_detail: schemas.JobDetailCreate):
+async def create_job_detail(db: AsyncSession, job_detail: schemas.JobDetailCreate):
+    before = await employee_contributions(db, job_detail.employee_number)
     db_job = models.JobDetail(**job_detail.dict())
     db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    await adjust_department_stats(db, before, await employee_contributions(db, job_detail.employee_number))
+    await db.commit()
+    await db.refresh(db_job)
     return db_job
 
-def update_job_detail(db: Session, job_id: int, job_detail: schemas.JobDetailCreate):
-    db_job = get_job_detail(db, job_id)
+async def update_job_detail(db: AsyncSession, job_id: int, job_detail: schemas.JobDetailCreate):
+    db_job = await get_job_detail(db, job_id)
+    # The row may move to another employee as well as another department
+    employee_numbers = {db_job.employee_number, job_detail.employee_number}
+    before = await employee_contributions(db, *employee_numbers)
     for key, value in job_detail.dict().items():
         setattr(db_job, key, value)
-    db.commit()
-    db.refresh(db_job)
+    await adjust_department_stats(db, before, await employee_contributions(db, *employee_numbers))
+    await db.commit()
+    await db.refresh(db_job)
     return db_job
 
-def delete_job_detail(db: Session, job_id: int):
-    db_job = get_job_detail(db, job_id)
-    db.delete(db_job)
-    db.commit()
+async def delete_job_detail(db: AsyncSession, job_id: int):
+    db_job = await get_job_detail(db, job_id)
+    before = await employee_contributions(db, db_job.employee_number)
+    await db.delete(db_job)
+    await adjust_department_stats(db, before, await employee_contributions(db, db_job.employee_number))
+    await db.commit()
     return {"message": f"Job detail {job_id} deleted successfully"}
@@ -0,0 +1,82 @@
+from sqlalchemy import case, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import models
+from ..pagination import decode_cursor
+
+# The rules of the calculate_attrition_risk stored procedure: (key, label, points, condition).
+# A missing related row scores no points, like the procedure's NULL variables.
+RISK_RULES = [
+    ("low_job_satisfaction", "Low Job Satisfaction", 25, models.SatisfactionScores.job_satisfaction <= 2),
+    ("low_environment_satisfaction", "Low Environment Satisfaction", 20, models.SatisfactionScores.environment_satisfaction <= 2),
+    ("poor_work_life_balance", "Poor Work-Life Balance", 20, models.SatisfactionScores.work_life_balance <= 2),
+    ("long_time_without_promotion", "Long Time Without Promotion", 15, models.PerformanceMetrics.years_since_last_promotion >= 5),
+    ("frequent_overtime", "Frequent Overtime", 10, models.JobDetail.overtime == "Yes"),
+    ("below_average_income", "Below Average Income", 10, models.Compensation.monthly_income < 3000),
+]
+
+# Lowest score of each risk level, highest level first; anything below is LOW
+RISK_LEVELS = [("HIGH", 60), ("MEDIUM", 30)]
+RISK_LEVEL_PATTERN = "^(LOW|MEDIUM|HIGH)$"
+
+def factor_query(department: str = None):
+    """One row per employee with the points of every rule, joined on the employee's one-to-one rows"""
+    query = (
+        select(
+            models.Employee.employee_number,
+            models.Department.department_name,
+            *[case((condition, points), else_=0).label(key) for key, _, points, condition in RISK_RULES],
+        )
+        .outerjoin(models.JobDetail, models.JobDetail.employee_number == models.Employee.employee_number)
+        .outerjoin(models.Department, models.Department.department_id == models.JobDetail.department_id)
+        .outerjoin(models.SatisfactionScores, models.SatisfactionScores.employee_number == models.Employee.employee_number)
+        .outerjoin(models.PerformanceMetrics, models.PerformanceMetrics.employee_number == models.Employee.employee_number)
+        .outerjoin(models.Compensation, models.Compensation.employee_number == models.Employee.employee_number)
+    )
+    if department:
+        query = query.filter(models.Department.department_name == department)
+    return query
+
+def level_range(score, level: str):
+    """WHERE clause selecting the scores of a risk level"""
+    bounds = dict(RISK_LEVELS)
+    if level == "HIGH":
+        return score >= bounds["HIGH"]
+    if level == "MEDIUM":
+        return (score >= bounds["MEDIUM"]) & (score < bounds["HIGH"])
+    return score < bounds["MEDIUM"]
+
+async def get_risk_scores(db: AsyncSession, department: str = None, level: str = None,
+                          skip: int = 0, limit: int = 100, cursor: str = None):
+    """
+    Score many employees with a single SELECT: each rule is a CASE over the
+    joined rows, the score is their sum and the level a CASE over the score.
+    Replaces one CALL calculate_attrition_risk (four lookups) per employee.
+    """
+    factors = factor_query(department).subquery()
+    points = [factors.c[key] for key, _, _, _ in RISK_RULES]
+    score = sum(points[1:], points[0])
+    risk_level = case(*[(score >= threshold, name) for name, threshold in RISK_LEVELS], else_="LOW")
+
+    query = select(factors, score.label("risk_score"), risk_level.label("risk_level"))
+    if level:
+        query = query.filter(level_range(score, level))
+    query = query.order_by(factors.c.employee_number)
+    if cursor:
+        # Keyset paging: seek past the last employee_number on the primary key
+        (after,) = decode_cursor(cursor, {"employee_number": int})
+        query = query.filter(factors.c.employee_number > after)
+    else:
+        query = query.offset(skip)
+
+    result = await db.execute(query.limit(limit))
+    return [
+        {
+            "employee_number": row["employee_number"],
+            "department_name": row["department_name"],
+            "risk_score": row["risk_score"],
+            "risk_level": row["risk_level"],
+            "risk_factors": [label for key, label, _, _ in RISK_RULES if row[key]],
+            "factor_points": {key: row[key] for key, _, _, _ in RISK_RULES},
+        }
+        for row in result.mappings().all()
+    ]
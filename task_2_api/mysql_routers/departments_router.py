@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ..database import get_db
-from .. import mongodb_schemas as schemas
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from .. import schemas
 from ..mysql_crud import mysql_departments_crud as crud
+from ..mysql_crud import department_stats_crud
+from ..pagination import set_next_cursor
 
 router = APIRouter(
     prefix="/mysql/departments",
@@ -10,20 +13,28 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=list[schemas.Department])
-def list_departments(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return crud.get_departments(db, skip, limit)
+async def list_departments(response: Response, skip: int = 0, limit: int = 10, cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    """Page with skip/limit, or pass the X-Next-Cursor header of the previous page as cursor"""
+    departments = await crud.get_departments(db, skip, limit, cursor)
+    set_next_cursor(response, departments, limit, lambda dept: {"department_id": dept.department_id})
+    return departments
+
+@router.get("/stats", response_model=list[schemas.DepartmentStats])
+async def department_stats(db: AsyncSession = Depends(get_async_db)):
+    """Headcount, attrition rate and average satisfaction and income per department, read from the department_stats summary"""
+    return await department_stats_crud.get_department_stats(db)
 
 @router.post("/", response_model=schemas.Department)
-def create_department(department: schemas.DepartmentCreate, db: Session = Depends(get_db)):
-    return crud.create_department(db, department)
+async def create_department(department: schemas.DepartmentCreate, db: AsyncSession = Depends(get_async_db)):
+    return await crud.create_department(db, department)
 
 @router.put("/{department_id}", response_model=schemas.Department)
-def update_department(department_id: int, department: schemas.DepartmentCreate, db: Session = Depends(get_db)):
-    return crud.update_department(db, department_id, department)
+async def update_department(department_id: int, department: schemas.DepartmentCreate, db: AsyncSession = Depends(get_async_db)):
+    return await crud.update_department(db, department_id, department)
 
 @router.delete("/{department_id}")
-def delete_department(department_id: int, db: Session = Depends(get_db)):
-    return crud.delete_department(db, department_id)
+async def delete_department(department_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await crud.delete_department(db, department_id)
 
 
 
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ..database import get_db
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
 from ..mysql_crud import employees_crud as crud
 from .. import models, schemas
+from ..pagination import cursor_key, set_next_cursor
+from ..export import EXPORT_BATCH_SIZE, EXPORT_FORMAT_PATTERN, export_response
 
 
 router = APIRouter(
@@ -10,33 +13,99 @@ router = APIRouter(
     tags=["Employees (MYSQL)"] 
 )
 
+def employee_filters(
+    department: Optional[str] = Query(None, description="Department name"),
+    job_role: Optional[str] = Query(None),
+    attrition: Optional[str] = Query(None),
+    gender: Optional[str] = Query(None),
+    min_age: Optional[int] = Query(None),
+    max_age: Optional[int] = Query(None),
+):
+    return dict(department=department, job_role=job_role, attrition=attrition,
+                gender=gender, min_age=min_age, max_age=max_age)
+
+SORT_DESCRIPTION = "Indexed column to sort by, prefixed with - for descending (e.g. -age)"
+
 @router.get("/", response_model=list[schemas.Employee])
-def list_employees(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return crud.get_employees(db, skip, limit)
+async def list_employees(
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    sort: str = Query("employee_number", description=SORT_DESCRIPTION),
+    filters: dict = Depends(employee_filters),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Page with skip/limit, or pass the X-Next-Cursor header of the previous page as cursor"""
+    employees = await crud.get_employees(db, skip, limit, cursor, sort, filters)
+    set_next_cursor(response, employees, limit, cursor_key("employee_number", sort))
+    return employees
 
 @router.post("/", response_model=schemas.Employee)
-def create_employee(employee: schemas.EmployeeCreate, db: Session = Depends(get_db)):
-    return crud.create_employee(db, employee)
+async def create_employee(employee: schemas.EmployeeCreate, db: AsyncSession = Depends(get_async_db)):
+    return await crud.create_employee(db, employee)
+
+@router.post("/bulk", response_model=list[schemas.BulkEmployeeResult])
+async def create_employees_bulk(employees: list[schemas.EmployeeCreate], db: AsyncSession = Depends(get_async_db)):
+    """Create many employees in one transaction; returns the ids assigned to each item, in order"""
+    return await crud.create_employees_bulk(db, employees)
+
+@router.get("/export")
+async def export_employees(format: str = Query("ndjson", pattern=EXPORT_FORMAT_PATTERN)):
+    """Stream every employee as NDJSON or CSV from a server-side cursor"""
+    return export_response(crud.stream_employees(EXPORT_BATCH_SIZE), format, "employees")
+
+@router.get("/changes", response_model=schemas.EmployeeChanges)
+async def list_employee_changes(
+    since: Optional[str] = Query(None, description="next_cursor of the previous call; omit to start from the beginning"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Employees created or modified since the cursor, in change order, with a cursor to resume from"""
+    return await crud.get_employee_changes(db, since, limit)
+
+@router.get("/profiles", response_model=list[schemas.EmployeeProfile])
+async def list_employee_profiles(
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    sort: str = Query("employee_number", description=SORT_DESCRIPTION),
+    filters: dict = Depends(employee_filters),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Full profiles (job, department, compensation, performance, satisfaction) in one query per page"""
+    profiles = await crud.get_employee_profiles(db, skip, limit, cursor, sort, filters)
+    set_next_cursor(response, profiles, limit, cursor_key("employee_number", sort))
+    return profiles
+
+@router.get("/{employee_number}/profile", response_model=schemas.EmployeeProfile)
+async def get_employee_profile(employee_number: int, db: AsyncSession = Depends(get_async_db)):
+    """Full profile of one employee across all six tables, in one query"""
+    profile = await crud.get_employee_profile(db, employee_number)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return profile
 
 @router.get("/{employee_number}", response_model=schemas.Employee)
-def get_employee(employee_number: int, db: Session = Depends(get_db)):
-    emp = crud.get_employee(db, employee_number)
+async def get_employee(employee_number: int, db: AsyncSession = Depends(get_async_db)):
+    emp = await crud.get_employee(db, employee_number)
     if not emp:
         raise HTTPException(status_code=404, detail="Employee not found")
     return emp
 
 @router.put("/{employee_number}", response_model=schemas.Employee)
-def update_employee(employee_number: int, employee: schemas.EmployeeCreate, db: Session = Depends(get_db)):
-    return crud.update_employee(db, employee_number, employee)
+async def update_employee(employee_number: int, employee: schemas.EmployeeCreate, db: AsyncSession = Depends(get_async_db)):
+    return await crud.update_employee(db, employee_number, employee)
 
 @router.delete("/{employee_number}")
-def delete_employee(employee_number: int, db: Session = Depends(get_db)):
-    return crud.delete_employee(db, employee_number)
+async def delete_employee(employee_number: int, db: AsyncSession = Depends(get_async_db)):
+    return await crud.delete_employee(db, employee_number)
 
 @router.get("/latest/entry", response_model=schemas.Employee)
-def get_latest_employee_entry(db: Session = Depends(get_db)):
+async def get_latest_employee_entry(db: AsyncSession = Depends(get_async_db)):
     """Get the latest employee entry by creation timestamp (created_at)"""
-    employee = crud.get_latest_employee(db)
+    employee = await crud.get_latest_employee(db)
     if not employee:
         raise HTTPException(status_code=404, detail="No employees found")
     return employee
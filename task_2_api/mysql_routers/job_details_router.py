@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from ..database import get_db
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
 from ..mysql_crud import mysql_ob_details_crud as crud
 from .. import schemas
+from ..pagination import cursor_key, set_next_cursor
 
 router = APIRouter(
     prefix="/mysql/job_details",
@@ -10,17 +12,34 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=list[schemas.JobDetail])
-def list_job_details(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return crud.get_job_details(db, skip, limit)
+async def list_job_details(
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    sort: str = Query("job_id", description="Indexed column to sort by, prefixed with - for descending (e.g. -job_level)"),
+    department_id: Optional[int] = Query(None),
+    job_role: Optional[str] = Query(None),
+    min_job_level: Optional[int] = Query(None),
+    max_job_level: Optional[int] = Query(None),
+    overtime: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Page with skip/limit, or pass the X-Next-Cursor header of the previous page as cursor"""
+    filters = dict(department_id=department_id, job_role=job_role, min_job_level=min_job_level,
+                   max_job_level=max_job_level, overtime=overtime)
+    job_details = await crud.get_job_details(db, skip, limit, cursor, sort, filters)
+    set_next_cursor(response, job_details, limit, cursor_key("job_id", sort))
+    return job_details
 
 @router.post("/", response_model=schemas.JobDetail)
-def create_job_detail(job_detail: schemas.JobDetailCreate, db: Session = Depends(get_db)):
-    return crud.create_job_detail(db, job_detail)
+async def create_job_detail(job_detail: schemas.JobDetailCreate, db: AsyncSession = Depends(get_async_db)):
+    return await crud.create_job_detail(db, job_detail)
 
 @router.put("/{job_id}", response_model=schemas.JobDetail)
-def update_job_detail(job_id: int, job_detail: schemas.JobDetailCreate, db: Session = Depends(get_db)):
-    return crud.update_job_detail(db, job_id, job_detail)
+async def update_job_detail(job_id: int, job_detail: schemas.JobDetailCreate, db: AsyncSession = Depends(get_async_db)):
+    return await crud.update_job_detail(db, job_id, job_detail)
 
 @router.delete("/{job_id}")
-def delete_job_detail(job_id: int, db: Session = Depends(get_db)):
-    return crud.delete_job_detail(db, job_id)
+async def delete_job_detail(job_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await crud.delete_job_detail(db, job_id)
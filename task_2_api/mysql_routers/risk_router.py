@@ -0,0 +1,31 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from .. import schemas
+from ..mysql_crud import risk_crud as crud
+from ..pagination import set_next_cursor
+
+router = APIRouter(
+    prefix="/mysql/risk",
+    tags=["Attrition Risk (MYSQL)"]
+)
+
+@router.get("/", response_model=list[schemas.RiskAssessment])
+async def list_risk_scores(
+    response: Response,
+    department: Optional[str] = Query(None, description="Department name"),
+    level: Optional[str] = Query(None, pattern=crud.RISK_LEVEL_PATTERN, description="LOW, MEDIUM or HIGH"),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=10000),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Attrition risk of every employee (or a department / risk level), scored with
+    the rules of the calculate_attrition_risk procedure in one set-based query.
+    Page with skip/limit, or pass the X-Next-Cursor header of the previous page as cursor.
+    """
+    scores = await crud.get_risk_scores(db, department, level, skip, limit, cursor)
+    set_next_cursor(response, scores, limit, lambda item: {"employee_number": item["employee_number"]})
+    return scores
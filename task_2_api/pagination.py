@@ -0,0 +1,140 @@
+"""
+Opaque cursor tokens for keyset pagination on the list endpoints.
+
+A cursor holds the sort key of the last item of a page. The next page starts
+right after that key with an indexed range condition, so every page costs the
+same however deep it is. The token is returned in the X-Next-Cursor response
+header and the list body is left unchanged; skip/limit offset paging still works.
+
+MySQL listings can also be sorted on any column that an index orders together
+with the primary key; the cursor then holds the sort value plus the primary key
+as tie-breaker.
+"""
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(key: dict) -> str:
+    """Encode the sort key of the last item of a page as an opaque token."""
+    raw = json.dumps(key, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, fields: dict) -> tuple:
+    """Decode a token made by encode_cursor into its key values.
+
+    fields maps each key name to a converter (int, ObjectId, ...); a token that
+    does not decode or convert is rejected with a 400.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return tuple(convert(key[name]) for name, convert in fields.items())
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def set_next_cursor(response: Response, items: list, limit: int, key):
+    """Set X-Next-Cursor from the last item when the page is full.
+
+    key maps an item to the dict stored in the token; a short page is the last
+    one and gets no header.
+    """
+    if items and len(items) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(key(items[-1]))
+
+
+def indexed_columns(model):
+    """Names of the columns an index of the model's table starts with as (column, primary key).
+
+    Only such an index serves ORDER BY column, primary key and the keyset range
+    on that pair; the primary key itself is always included.
+    """
+    table = model.__table__
+    key = list(table.primary_key.columns)[0].name
+    columns = {key}
+    for index in table.indexes:
+        names = [column.name for column in index.columns]
+        if names[1:2] == [key]:
+            columns.add(names[0])
+    return columns
+
+
+def sort_column(model, sort: str):
+    """Resolve a sort parameter ("age", "-age") to (column, descending).
+
+    Only columns indexed together with the primary key are accepted, so a sort
+    never turns into a filesort over the whole table; anything else is rejected
+    with a 400.
+    """
+    descending = sort.startswith("-")
+    name = sort.lstrip("-")
+    allowed = indexed_columns(model)
+    if name not in allowed:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot sort by '{name}': no index. Sortable columns: {', '.join(sorted(allowed))}",
+        )
+    return getattr(model, name), descending
+
+
+def keyset_paginate(query, model, key: str, sort: str, skip: int, limit: int, cursor: str = None):
+    """Order a query by sort (then by the primary key) and apply the cursor or the offset"""
+    key_column = getattr(model, key)
+    column, descending = sort_column(model, sort)
+    order = [column] if column is key_column else [column, key_column]
+    query = query.order_by(*[col.desc() if descending else col for col in order])
+
+    if not cursor:
+        return query.offset(skip).limit(limit)
+
+    after = lambda col, value: col < value if descending else col > value
+    if column is key_column:
+        (last_key,) = decode_cursor(cursor, {key: int})
+        return query.filter(after(key_column, last_key)).limit(limit)
+
+    python_type = column.type.python_type
+    convert = datetime.fromisoformat if python_type is datetime else python_type
+    last_sort, last_value, last_key = decode_cursor(
+        cursor, {"sort": str, "value": lambda value: None if value is None else convert(value), key: int}
+    )
+    if last_sort != sort:
+        raise HTTPException(status_code=400, detail="Cursor was issued for a different sort")
+    return query.filter(after_key(column, key_column, last_value, last_key, descending)).limit(limit)
+
+
+def after_key(column, key_column, last_value, last_key, descending: bool):
+    """Condition for rows past (last_value, last_key) in the sort order.
+
+    MySQL sorts NULL before every value ascending and after every value
+    descending, and a plain comparison with NULL matches nothing, so NULL sort
+    values are handled with IS NULL / IS NOT NULL.
+    """
+    after = lambda col, value: col < value if descending else col > value
+    if last_value is None:
+        same_value = and_(column.is_(None), after(key_column, last_key))
+        return same_value if descending else or_(same_value, column.isnot(None))
+    condition = or_(
+        after(column, last_value),
+        and_(column == last_value, after(key_column, last_key)),
+    )
+    return or_(condition, column.is_(None)) if descending else condition
+
+
+def cursor_key(key: str, sort: str):
+    """Map an item to the cursor dict matching keyset_paginate for this sort"""
+    name = sort.lstrip("-")
+    if name == key:
+        return lambda item: {key: getattr(item, key)}
+
+    def value(item):
+        value = getattr(item, name)
+        return value.isoformat() if isinstance(value, datetime) else value
+
+    return lambda item: {"sort": sort, "value": value(item), key: getattr(item, key)}
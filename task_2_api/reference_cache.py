@@ -0,0 +1,79 @@
+"""
+In-process cache for reference data that hardly ever changes (departments).
+
+It holds only reference lookups: MySQL department name -> department_id. Listing
+pages and documents are left to the HTTP response cache (response_cache.py), so
+paging traffic cannot evict them. Keys are tuples whose first element names the
+namespace ("mysql"), so a database's department routes can drop their own
+entries.
+Entries expire after a TTL and the least recently used ones are evicted past
+the size bound.
+"""
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEPARTMENT_CACHE_TTL = float(os.getenv("DEPARTMENT_CACHE_TTL", 300))
+DEPARTMENT_CACHE_SIZE = int(os.getenv("DEPARTMENT_CACHE_SIZE", 1024))
+
+
+class ReferenceCache:
+    """Thread-safe TTL + LRU cache with hit/miss counters"""
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return a copy of the cached value, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespace: str = None):
+        """Drop every entry of a namespace, or the whole cache"""
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == namespace]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+department_cache = ReferenceCache(DEPARTMENT_CACHE_TTL, DEPARTMENT_CACHE_SIZE)
@@ -0,0 +1,171 @@
+"""
+HTTP response cache for the read endpoints dashboards poll.
+
+GET responses of the routes in CACHED_ROUTES are kept in memory with a per-route
+TTL and an ETag. A repeated request is answered from memory, and one sending a
+matching If-None-Match gets a 304 without reaching the database. Any
+POST/PUT/PATCH/DELETE under a prefix in INVALIDATED_BY drops the cached
+responses of the matching tags. Entries are evicted least recently used first
+once the byte budget is exceeded.
+"""
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+load_dotenv()
+
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+
+# (path pattern, tag, TTL in seconds) of the cached GET routes
+CACHED_ROUTES = [
+    (re.compile(r"^/mysql/departments/?$"), "mysql_departments", 300),
+    (re.compile(r"^/mongo/departments(/[^/]*)?$"), "mongo_departments", 300),
+    (re.compile(r"^/mongo/predictions/employee/\d+$"), "mongo_predictions", 60),
+]
+
+# Write routes (path prefix) and the tags whose cached responses they make stale.
+# Creating or updating a MySQL employee can create a department.
+INVALIDATED_BY = [
+    ("/mysql/departments", ["mysql_departments"]),
+    ("/mysql/employees", ["mysql_departments"]),
+    ("/mongo/departments", ["mongo_departments"]),
+    ("/mongo/predictions", ["mongo_predictions"]),
+]
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Response headers stored with a cached body (content-length is recomputed)
+STORED_HEADERS = ("content-type", "x-next-cursor")
+
+
+class ResponseCache:
+    """LRU store of response bodies bounded by their total size in bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._entries = OrderedDict()
+        # Bumped by every invalidation of a tag, so a response read before a
+        # write but finished after it is not stored
+        self._generations = {}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry["expires"] < time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def generation(self, tag: str):
+        return self._generations.get(tag, 0)
+
+    def set(self, key, tag: str, ttl: float, body: bytes, headers: dict, generation: int = 0):
+        """Store a response body and return its entry, or None when it is too large or already stale"""
+        if len(body) > self.max_bytes or generation != self.generation(tag):
+            return None
+        if key in self._entries:
+            self._remove(key)
+        entry = self._entries[key] = {
+            "tag": tag,
+            "expires": time.monotonic() + ttl,
+            "body": body,
+            "headers": headers,
+            "etag": '"' + hashlib.sha1(body).hexdigest() + '"',
+        }
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+        return entry
+
+    def invalidate(self, tags):
+        for tag in tags:
+            self._generations[tag] = self.generation(tag) + 1
+        for key in [key for key, entry in self._entries.items() if entry["tag"] in tags]:
+            self._remove(key)
+
+    def _remove(self, key):
+        self.size -= len(self._entries.pop(key)["body"])
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_BYTES)
+
+
+def cached_route(path: str):
+    for pattern, tag, ttl in CACHED_ROUTES:
+        if pattern.match(path):
+            return tag, ttl
+    return None
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match list ("*", or tags with or without W/) with an ETag"""
+    if if_none_match is None:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def cached_response(request: Request, entry: dict, state: str):
+    """Build the response for a cache entry, a 304 when the client already has it"""
+    headers = {"ETag": entry["etag"], "Cache-Control": "no-cache", "X-Cache": state}
+    if etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], headers={**entry["headers"], **headers})
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+
+        if request.method in WRITE_METHODS:
+            response = await call_next(request)
+            for prefix, tags in INVALIDATED_BY:
+                if path.startswith(prefix):
+                    response_cache.invalidate(tags)
+            return response
+
+        route = cached_route(path) if request.method == "GET" else None
+        if route is None:
+            return await call_next(request)
+
+        key = (path, str(request.query_params))
+        entry = response_cache.get(key)
+        if entry is not None:
+            return cached_response(request, entry, "HIT")
+
+        tag, ttl = route
+        generation = response_cache.generation(tag)
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        entry = response_cache.set(key, tag, ttl, body, headers, generation)
+        if entry is None:
+            return Response(content=body, status_code=200, headers=headers)
+        return cached_response(request, entry, "MISS")
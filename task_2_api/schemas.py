@@ -1,6 +1,7 @@
 from sqlalchemy import Integer
 from pydantic import BaseModel
 from typing import Optional 
+from datetime import datetime
 
 class EmployeeBase(BaseModel):
     age: int
@@ -24,6 +25,29 @@ class Employee(EmployeeBase):
     class Config:
         from_attributes = True
 
+class EmployeeChange(Employee):
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    change_id: int
+
+class EmployeeChanges(BaseModel):
+    changes: list[EmployeeChange]
+    next_cursor: Optional[str] = None
+
+class BulkEmployeeResult(BaseModel):
+    index: int
+    employee_number: int
+    department_id: int
+    job_id: int
+
+class RiskAssessment(BaseModel):
+    employee_number: int
+    department_name: Optional[str] = None
+    risk_score: int
+    risk_level: str
+    risk_factors: list[str]
+    factor_points: dict[str, int]
+
 # ---------------------------
 # Department Schemas
 # ---------------------------
@@ -40,6 +64,19 @@ class Department(DepartmentBase):
     class Config:
         orm_mode = True
 
+class DepartmentStats(BaseModel):
+    department_id: int
+    department_name: str
+    employee_count: int
+    attrition_count: int
+    attrition_rate: float
+    avg_job_satisfaction: Optional[float] = None
+    avg_environment_satisfaction: Optional[float] = None
+    avg_relationship_satisfaction: Optional[float] = None
+    avg_work_life_balance: Optional[float] = None
+    avg_monthly_income: Optional[float] = None
+    updated_at: Optional[datetime] = None
+
 
 # ---------------------------
 # JobDetail Schemas
@@ -63,3 +100,67 @@ class JobDetail(JobDetailBase):
 
     class Config:
         orm_mode = True
+
+
+# ---------------------------
+# Employee Profile Schemas
+# ---------------------------
+class Compensation(BaseModel):
+    daily_rate: int
+    hourly_rate: int
+    monthly_income: int
+    monthly_rate: int
+    percent_salary_hike: int
+    stock_option_level: int
+
+    class Config:
+        from_attributes = True
+
+class PerformanceMetrics(BaseModel):
+    performance_rating: int
+    years_at_company: int
+    years_in_current_role: int
+    years_since_last_promotion: int
+    years_with_curr_manager: int
+    total_working_years: int
+    num_companies_worked: int
+    training_times_last_year: int
+
+    class Config:
+        from_attributes = True
+
+class SatisfactionScores(BaseModel):
+    environment_satisfaction: int
+    job_satisfaction: int
+    relationship_satisfaction: int
+    work_life_balance: int
+
+    class Config:
+        from_attributes = True
+
+class JobProfile(JobDetailBase):
+    job_id: int
+    standard_hours: Optional[int] = None
+    department: Optional[Department] = None
+
+    class Config:
+        from_attributes = True
+
+class EmployeeProfile(BaseModel):
+    employee_number: int
+    age: int
+    gender: str
+    marital_status: str
+    education: int
+    education_field: str
+    distance_from_home: int
+    over_18: str
+    employee_count: int
+    attrition: str
+    job_details: Optional[JobProfile] = None
+    compensation: Optional[Compensation] = None
+    performance_metrics: Optional[PerformanceMetrics] = None
+    satisfaction_scores: Optional[SatisfactionScores] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,11 @@
+import os
+
+# database.py and mongo_database.py build their clients at import time; the tests
+# run against their own SQLite engine, so placeholder settings are enough
+os.environ.setdefault("MYSQL_USER", "test")
+os.environ.setdefault("MYSQL_PASSWORD", "test")
+os.environ.setdefault("MYSQL_HOST", "localhost")
+os.environ.setdefault("MYSQL_PORT", "3306")
+os.environ.setdefault("MYSQL_DATABASE", "test")
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB", "test")
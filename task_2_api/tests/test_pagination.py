@@ -0,0 +1,58 @@
+import asyncio
+from datetime import datetime
+
+from fastapi import Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from task_2_api import models
+from task_2_api.database import Base
+from task_2_api.pagination import NEXT_CURSOR_HEADER, cursor_key, indexed_columns, keyset_paginate, set_next_cursor
+
+
+async def page_through(sort: str, limit: int):
+    """Walk every cursor page of employees sorted by sort; returns the employee numbers in order"""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    sessions = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as db:
+        for number in range(1, 8):
+            db.add(models.Employee(
+                employee_number=number, age=30, gender="Female", marital_status="Single",
+                education=3, education_field="Medical", distance_from_home=5, over_18="Y",
+                employee_count=1, attrition="No", updated_at=datetime(2024, 1, 1 + number % 2),
+            ))
+        await db.commit()
+        # Every third employee loses its updated_at, so pages start and end on NULL sort values
+        await db.execute(update(models.Employee).filter(models.Employee.employee_number % 3 == 0)
+                         .values(updated_at=None))
+        await db.commit()
+
+    seen, cursor = [], None
+    async with sessions() as db:
+        while True:
+            query = keyset_paginate(select(models.Employee), models.Employee, "employee_number",
+                                    sort, 0, limit, cursor)
+            employees = (await db.execute(query)).scalars().all()
+            seen.extend(employee.employee_number for employee in employees)
+            response = Response()
+            set_next_cursor(response, employees, limit, cursor_key("employee_number", sort))
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if not cursor:
+                break
+    await engine.dispose()
+    return seen
+
+
+def test_cursor_pages_cover_null_sort_values():
+    # SQLite, like MySQL, sorts NULL first ascending and last descending
+    assert asyncio.run(page_through("updated_at", 2)) == [3, 6, 2, 4, 1, 5, 7]
+    assert asyncio.run(page_through("-updated_at", 2)) == [7, 5, 1, 4, 2, 6, 3]
+
+
+def test_sortable_columns_are_indexed_with_the_primary_key():
+    # (attrition, age, employee_number) and (department_id, job_role, employee_number) do not qualify
+    assert indexed_columns(models.Employee) == {"employee_number", "age", "created_at", "updated_at"}
+    assert indexed_columns(models.JobDetail) == {"job_id", "job_level"}
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from task_2_api import models
+from task_2_api.database import Base
+from task_2_api.mysql_crud import employees_crud
+
+
+def employee_rows(employee_number: int, department_id: int):
+    """An employee with every one-to-one row the profile reads"""
+    employee = models.Employee(
+        employee_number=employee_number, age=30, gender="Female", marital_status="Single",
+        education=3, education_field="Medical", distance_from_home=5, over_18="Y",
+        employee_count=1, attrition="No",
+    )
+    return [
+        employee,
+        models.JobDetail(employee_number=employee_number, department_id=department_id,
+                         job_role="Research Scientist", job_level=2),
+        models.Compensation(employee_number=employee_number, daily_rate=800, hourly_rate=60,
+                            monthly_income=5000, monthly_rate=15000, percent_salary_hike=12,
+                            stock_option_level=1),
+        models.PerformanceMetrics(employee_number=employee_number, performance_rating=3,
+                                  years_at_company=4, years_in_current_role=2,
+                                  years_since_last_promotion=1, years_with_curr_manager=2,
+                                  total_working_years=8, num_companies_worked=2,
+                                  training_times_last_year=3),
+        models.SatisfactionScores(employee_number=employee_number, environment_satisfaction=3,
+                                  job_satisfaction=4, relationship_satisfaction=2,
+                                  work_life_balance=3),
+    ]
+
+
+async def count_profile_selects(employee_total: int, limit: int):
+    """Load a profile and a profile page; returns the SELECTs each one executed"""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    sessions = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as db:
+        db.add(models.Department(department_id=1, department_name="Research & Development"))
+        for number in range(1, employee_total + 1):
+            db.add_all(employee_rows(number, 1))
+        await db.commit()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async with sessions() as db:
+            profile = await employees_crud.get_employee_profile(db, 1)
+            # Every relationship must already be loaded: the lazy="raise" ones fail otherwise
+            assert profile.job_details.department.department_name == "Research & Development"
+            assert profile.compensation.monthly_income == 5000
+            single = len([s for s in statements if s.lstrip().upper().startswith("SELECT")])
+
+        statements.clear()
+        async with sessions() as db:
+            profiles = await employees_crud.get_employee_profiles(db, limit=limit)
+            assert len(profiles) == min(limit, employee_total)
+            for profile in profiles:
+                assert profile.job_details.department.department_name == "Research & Development"
+                assert profile.performance_metrics.performance_rating == 3
+                assert profile.satisfaction_scores.job_satisfaction == 4
+            page = len([s for s in statements if s.lstrip().upper().startswith("SELECT")])
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+        await engine.dispose()
+
+    return single, page
+
+
+@pytest.mark.parametrize("employee_total, limit", [(1, 10), (10, 10), (60, 50)])
+def test_profiles_load_in_one_select(employee_total, limit):
+    single, page = asyncio.run(count_profile_selects(employee_total, limit))
+    assert single == 1
+    assert page == 1